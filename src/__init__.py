@@ -1,8 +1,15 @@
 """AI Test Case Generator - Generate test cases from requirements using LLMs."""
 
-from .generator import TestCaseGenerator
 from .edge_cases import EdgeCaseAnalyzer
 
 __version__ = "1.0.0"
 __all__ = ["TestCaseGenerator", "EdgeCaseAnalyzer"]
 
+
+def __getattr__(name):
+    # Import the generator lazily so the CLI and analyzer don't pay for the LLM SDK
+    if name == "TestCaseGenerator":
+        from .generator import TestCaseGenerator
+        return TestCaseGenerator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
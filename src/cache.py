@@ -0,0 +1,273 @@
+"""
+Response Cache
+
+Cache LLM responses so identical prompts skip the network round-trip.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Protocol, Sequence
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "ai-test-generator"
+
+
+def _write_atomic(path: Path, write: Callable[[Any], None], mode: str = "w") -> None:
+    """Write a file through a temporary file that replaces it only once complete."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode, encoding=None if "b" in mode else "utf-8") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class LLMCache(Protocol):
+    """Storage backend for cached LLM responses (disk, Redis, Memcached, ...)."""
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, or None on a miss."""
+        ...
+    
+    def set(self, key: str, value: str) -> None:
+        """Store a response under key."""
+        ...
+
+
+class DiskCache:
+    """
+    LLM response cache persisted as a JSON file.
+    
+    Holds at most max_entries responses; the oldest written are evicted first.
+    """
+    
+    def __init__(self, path: Optional[Path] = None, max_entries: int = 1000):
+        """
+        Initialize the disk cache.
+        
+        Args:
+            path: Cache file location (default: ~/.cache/ai-test-generator/cache.json)
+            max_entries: Maximum number of cached responses
+        """
+        self.path = Path(path) if path else DEFAULT_CACHE_DIR / "cache.json"
+        self.max_entries = max_entries
+        self._entries: Optional[Dict[str, str]] = None
+        self._mtime: Optional[int] = None
+        self._lock = threading.Lock()
+    
+    def _stat_mtime(self) -> Optional[int]:
+        """Get the cache file's modification time, or None if it does not exist."""
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+    
+    def _read(self) -> Dict[str, str]:
+        """Read the cache file, treating a missing or corrupt file as empty."""
+        self._mtime = self._stat_mtime()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, or None on a miss."""
+        if self._entries is None:
+            self._entries = self._read()
+        return self._entries.get(key)
+    
+    def set(self, key: str, value: str) -> None:
+        """Store a response under key and write the cache file atomically."""
+        with self._lock:
+            # Re-read only if another writer changed the file since we last saw it
+            if self._entries is None or self._stat_mtime() != self._mtime:
+                self._entries = self._read()
+            entries = self._entries
+            
+            # Re-inserting moves the key to the end of the eviction order
+            entries.pop(key, None)
+            entries[key] = value
+            for stale in list(entries)[:max(0, len(entries) - self.max_entries)]:
+                del entries[stale]
+            
+            _write_atomic(self.path, lambda f: json.dump(entries, f))
+            self._mtime = self._stat_mtime()
+
+
+class SemanticCache:
+    """
+    Cache LLM responses by requirement meaning rather than exact text.
+    
+    Requirements are embedded and a stored response is reused when the cosine
+    similarity to a previous requirement exceeds the threshold. Entries are
+    partitioned into buckets (model, format, ...) so a response is never
+    served for a request with different generation settings.
+    
+    With a path, entries are written every save_every inserts; call save()
+    (or use the cache as a context manager) to write the rest.
+    """
+    
+    def __init__(
+        self,
+        embed: Callable[[str], Sequence[float]],
+        threshold: float = 0.92,
+        path: Optional[Path] = None,
+        save_every: int = 32
+    ):
+        """
+        Initialize the semantic cache.
+        
+        Args:
+            embed: Function mapping text to an embedding vector
+            threshold: Minimum cosine similarity for a cache hit (0-1)
+            path: Optional .npz file to persist embeddings to; responses go
+                to a .json file next to it
+            save_every: Number of inserts after which entries are written to path
+        """
+        # Lazy import numpy: it is slow to load and only the semantic cache needs it
+        try:
+            import numpy as np
+        except ImportError:
+            raise ImportError("numpy required for semantic caching: pip install numpy")
+        self._np = np
+        
+        self._embed = embed
+        self.threshold = threshold
+        self.path = Path(path) if path else None
+        self.save_every = save_every
+        self.stats = {"hits": 0, "misses": 0}
+        self._unsaved = 0
+        
+        # bucket -> unit-normalized float32 embeddings and the matching responses.
+        # Embedding arrays are over-allocated; only the first len(responses)
+        # rows are in use.
+        self._embeddings: Dict[str, Any] = {}
+        self._responses: Dict[str, List[str]] = {}
+        
+        if self.path is not None and self.path.exists():
+            self._load()
+    
+    @staticmethod
+    def bucket(*settings: Any) -> str:
+        """Build a bucket id from the generation settings that affect a response."""
+        payload = json.dumps(settings, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+    
+    def embed(self, text: str) -> Any:
+        """Embed text as a unit-length float32 vector."""
+        np = self._np
+        return self._normalize(np.asarray(self._embed(text), dtype=np.float32))
+    
+    def _normalize(self, vectors: Any) -> Any:
+        """Scale vectors (rows) to unit length so cosine similarity is a dot product."""
+        np = self._np
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+    
+    def get(self, vector: Any, bucket: str) -> Optional[str]:
+        """
+        Look up the response for the most similar stored requirement.
+        
+        Args:
+            vector: Embedding of the incoming requirement, from embed()
+            bucket: Bucket id from bucket()
+            
+        Returns:
+            The cached response, or None if nothing is similar enough
+        """
+        responses = self._responses.get(bucket)
+        if responses:
+            # One matrix-vector product (BLAS) over every stored embedding
+            sims = self._embeddings[bucket][:len(responses)] @ vector
+            i = int(sims.argmax())
+            if sims[i] >= self.threshold:
+                self.stats["hits"] += 1
+                return self._responses[bucket][i]
+        
+        self.stats["misses"] += 1
+        return None
+    
+    def add(self, vector: Any, bucket: str, response: str) -> None:
+        """Store a response for an embedded requirement."""
+        np = self._np
+        row = self._normalize(np.asarray(vector, dtype=np.float32))
+        responses = self._responses.setdefault(bucket, [])
+        embeddings = self._embeddings.get(bucket)
+        
+        # Grow by doubling so inserts are amortized O(D) rather than a full copy
+        if embeddings is None:
+            embeddings = np.empty((8, row.shape[0]), dtype=np.float32)
+        elif len(responses) == embeddings.shape[0]:
+            grown = np.empty((embeddings.shape[0] * 2, embeddings.shape[1]), dtype=np.float32)
+            grown[:len(responses)] = embeddings
+            embeddings = grown
+        
+        embeddings[len(responses)] = row
+        self._embeddings[bucket] = embeddings
+        responses.append(response)
+        
+        # Rewriting the files is O(N), so it is batched rather than done per insert
+        self._unsaved += 1
+        if self.path is not None and self._unsaved >= self.save_every:
+            self.save()
+    
+    @property
+    def _responses_path(self) -> Path:
+        """Location of the JSON file holding the responses."""
+        return self.path.with_suffix(".json")
+    
+    def save(self) -> None:
+        """Write all entries to path atomically (no-op without a path or unsaved entries)."""
+        if self.path is None or not self._unsaved:
+            return
+        
+        np = self._np
+        embeddings = {
+            f"emb_{bucket}": self._embeddings[bucket][:len(responses)]
+            for bucket, responses in self._responses.items()
+        }
+        
+        # Responses are variable-length text, kept out of the fixed-width numpy arrays
+        _write_atomic(self._responses_path, lambda f: json.dump(self._responses, f, ensure_ascii=False))
+        _write_atomic(self.path, lambda f: np.savez(f, **embeddings), mode="wb")
+        self._unsaved = 0
+    
+    def __enter__(self) -> "SemanticCache":
+        """Use the cache as a context manager that saves unsaved entries on exit."""
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        """Save unsaved entries when leaving the with block."""
+        self.save()
+    
+    def _load(self) -> None:
+        """Load entries from the .npz and .json files."""
+        np = self._np
+        try:
+            with open(self._responses_path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            stored = {}
+        
+        with np.load(self.path) as data:
+            for name in data.files:
+                if name.startswith("emb_"):
+                    bucket = name[len("emb_"):]
+                    embeddings = np.asarray(data[name], dtype=np.float32)
+                    responses = stored.get(bucket)
+                    if responses is None and f"resp_{bucket}" in data.files:
+                        # Files written before responses moved to the .json file
+                        responses = [str(r) for r in data[f"resp_{bucket}"]]
+                    # An interrupted save can leave the two files out of step
+                    count = min(len(embeddings), len(responses or []))
+                    if count:
+                        self._embeddings[bucket] = self._normalize(embeddings[:count])
+                        self._responses[bucket] = list(responses[:count])
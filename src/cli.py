@@ -3,38 +3,60 @@ Command Line Interface for AI Test Case Generator
 """
 
 import argparse
+import os
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
-from .generator import TestCaseGenerator
 from .edge_cases import EdgeCaseAnalyzer
 
 
-def create_parser() -> argparse.ArgumentParser:
-    """Create the argument parser."""
-    parser = argparse.ArgumentParser(
-        prog="ai-test-generator",
-        description="Generate test cases from requirements using AI",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  %(prog)s generate --input requirements.txt
-  %(prog)s generate --input story.txt --format pytest --output tests/
-  %(prog)s generate --jira PROJ-123 --format gherkin
-  %(prog)s interactive
-  %(prog)s analyze --input requirements.txt
-        """
-    )
+def _read_text_fast(path: Path) -> str:
+    """
+    Read a UTF-8 text file with raw OS reads.
     
-    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+    Skips the buffered/text wrapper layers of Path.read_text(), which dominate
+    for the small requirement files the CLI reads once.
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        chunks = []
+        while True:
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    finally:
+        os.close(fd)
     
-    # Generate command
-    gen_parser = subparsers.add_parser("generate", help="Generate test cases")
+    text = b"".join(chunks).decode("utf-8")
+    
+    # Match read_text()'s universal newline handling
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+# Output formats accepted by --format, in display order
+FORMATS = ("gherkin", "pytest", "testng", "plain", "json")
+_FORMAT_CHOICES = frozenset(FORMATS)
+
+
+def _format_type(value: str) -> str:
+    """Validate a --format value with a single set lookup."""
+    if value not in _FORMAT_CHOICES:
+        raise argparse.ArgumentTypeError(
+            f"invalid choice: {value!r} (choose from {', '.join(FORMATS)})"
+        )
+    return value
+
+
+def _add_generate_arguments(gen_parser: argparse.ArgumentParser) -> None:
+    """Register the arguments of the generate command."""
     gen_parser.add_argument(
         "--input", "-i",
         type=str,
-        help="Input file containing requirement(s)"
+        help="Input file containing requirement(s), or a directory of .txt files to batch"
     )
     gen_parser.add_argument(
         "--jira", "-j",
@@ -43,9 +65,9 @@ Examples:
     )
     gen_parser.add_argument(
         "--format", "-f",
-        type=str,
+        type=_format_type,
         default="gherkin",
-        choices=["gherkin", "pytest", "testng", "plain", "json"],
+        metavar="{" + ",".join(FORMATS) + "}",
         help="Output format (default: gherkin)"
     )
     gen_parser.add_argument(
@@ -64,22 +86,74 @@ Examples:
         action="store_true",
         help="Don't include edge cases"
     )
-    
-    # Interactive command
-    int_parser = subparsers.add_parser("interactive", help="Interactive mode")
-    
-    # Analyze command
-    analyze_parser = subparsers.add_parser("analyze", help="Analyze requirements for edge cases")
+
+
+def _add_interactive_arguments(int_parser: argparse.ArgumentParser) -> None:
+    """Register the arguments of the interactive command."""
+
+
+def _add_analyze_arguments(analyze_parser: argparse.ArgumentParser) -> None:
+    """Register the arguments of the analyze command."""
     analyze_parser.add_argument(
         "--input", "-i",
         type=str,
         required=True,
         help="Input file containing requirement(s)"
     )
+
+
+# Subcommand name -> (help text, argument builder)
+SUBCOMMANDS = {
+    "generate": ("Generate test cases", _add_generate_arguments),
+    "interactive": ("Interactive mode", _add_interactive_arguments),
+    "analyze": ("Analyze requirements for edge cases", _add_analyze_arguments),
+}
+
+
+def create_parser(argv: Optional[List[str]] = None) -> argparse.ArgumentParser:
+    """
+    Create the argument parser.
+    
+    Args:
+        argv: Command-line arguments that will be parsed. When given, only the
+            selected subcommand gets its arguments registered; the others are
+            listed by name only. When omitted, every subcommand is built.
+    """
+    parser = argparse.ArgumentParser(
+        prog="ai-test-generator",
+        description="Generate test cases from requirements using AI",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s generate --input requirements.txt
+  %(prog)s generate --input story.txt --format pytest --output tests/
+  %(prog)s generate --jira PROJ-123 --format gherkin
+  %(prog)s interactive
+  %(prog)s analyze --input requirements.txt
+        """
+    )
+    
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+    
+    selected = argv[0] if argv else None
+    for name, (help_text, add_arguments) in SUBCOMMANDS.items():
+        command_parser = subparsers.add_parser(name, help=help_text)
+        if argv is None or name == selected:
+            add_arguments(command_parser)
     
     return parser
 
 
+# Output file extension per format
+EXTENSIONS = {
+    "gherkin": ".feature",
+    "pytest": ".py",
+    "testng": ".java",
+    "plain": ".txt",
+    "json": ".json"
+}
+
+
 def cmd_generate(args) -> int:
     """Handle the generate command."""
     # Get requirement text
@@ -88,12 +162,14 @@ def cmd_generate(args) -> int:
         if not input_path.exists():
             print(f"❌ Error: Input file not found: {args.input}", file=sys.stderr)
             return 1
-        requirement = input_path.read_text()
+        if input_path.is_dir():
+            return _generate_directory(args, input_path)
+        requirement = _read_text_fast(input_path)
     elif args.jira:
         try:
             from .jira_client import JiraClient
-            client = JiraClient()
-            requirement = client.get_ticket_description(args.jira)
+            with JiraClient() as client:
+                requirement = client.get_ticket_description(args.jira)
         except ImportError:
             print("❌ Error: Jira integration requires additional setup", file=sys.stderr)
             return 1
@@ -111,6 +187,7 @@ def cmd_generate(args) -> int:
     
     # Generate test cases
     try:
+        from .generator import TestCaseGenerator
         generator = TestCaseGenerator()
         result = generator.generate(
             requirement=requirement,
@@ -126,17 +203,8 @@ def cmd_generate(args) -> int:
     if args.output:
         output_path = Path(args.output)
         
-        # Determine file extension
-        extensions = {
-            "gherkin": ".feature",
-            "pytest": ".py",
-            "testng": ".java",
-            "plain": ".txt",
-            "json": ".json"
-        }
-        
         if output_path.is_dir():
-            output_file = output_path / f"generated_tests{extensions[args.format]}"
+            output_file = output_path / f"generated_tests{EXTENSIONS[args.format]}"
         else:
             output_file = output_path
         
@@ -149,54 +217,128 @@ def cmd_generate(args) -> int:
     return 0
 
 
+def _generate_directory(args, input_dir: Path) -> int:
+    """Generate test cases for every .txt requirement file in a directory with batched LLM calls."""
+    input_files = sorted(input_dir.glob("*.txt"))
+    if not input_files:
+        print(f"❌ Error: No .txt requirement files found in: {input_dir}", file=sys.stderr)
+        return 1
+    
+    # Checked before the (paid) batch call so its result is not lost
+    if args.output and Path(args.output).exists() and not Path(args.output).is_dir():
+        print(f"❌ Error: Output path must be a directory: {args.output}", file=sys.stderr)
+        return 1
+    
+    requirements = [_read_text_fast(path) for path in input_files]
+    
+    print(f"🧠 Generating test cases for {len(input_files)} requirements...")
+    print(f"   Format: {args.format}")
+    print(f"   Target cases: {args.num_cases} each")
+    print()
+    
+    try:
+        from .generator import TestCaseGenerator
+        generator = TestCaseGenerator()
+        results = generator.generate_batch(
+            requirements,
+            output_format=args.format,
+            num_cases_each=args.num_cases,
+            include_edge_cases=not args.no_edge_cases
+        )
+    except Exception as e:
+        print(f"❌ Error generating test cases: {e}", file=sys.stderr)
+        return 1
+    
+    if args.output:
+        output_dir = Path(args.output)
+        output_dir.mkdir(parents=True, exist_ok=True)
+    
+    failed = []
+    for path, result in zip(input_files, results):
+        if not result.strip():
+            failed.append(path.name)
+            print(f"❌ Error: No test cases generated for: {path.name}", file=sys.stderr)
+        elif args.output:
+            output_file = output_dir / f"{path.stem}{EXTENSIONS[args.format]}"
+            output_file.write_text(result)
+            print(f"✅ Test cases written to: {output_file}")
+        else:
+            print(f"📄 {path.name}")
+            print(result)
+            print()
+    
+    return 1 if failed else 0
+
+
 def cmd_interactive(args) -> int:
     """Handle interactive mode."""
     print("🧠 AI Test Case Generator - Interactive Mode")
     print("=" * 50)
-    print("Enter your requirement (press Enter twice when done):")
-    print()
+    formats = {"1": "gherkin", "2": "pytest", "3": "testng", "4": "plain", "5": "json"}
     
-    lines = []
-    empty_count = 0
-    
-    while empty_count < 1:
+    if not sys.stdin.isatty():
+        # Piped input: read it in one go, with the same layout as typed input
+        # (requirement up to the first empty line, then the format choice)
+        # and without the prompts
+        lines = sys.stdin.read().splitlines()
+        end = lines.index("") if "" in lines else len(lines)
+        requirement = "\n".join(lines[:end])
+        choice = lines[end + 1] if end + 1 < len(lines) else ""
+        
+        if not requirement.strip():
+            print("❌ No requirement provided", file=sys.stderr)
+            return 1
+    else:
+        print("Enter your requirement (press Enter twice when done):")
+        print()
+        
         try:
-            line = input()
-            if line == "":
-                empty_count += 1
-            else:
-                empty_count = 0
-                lines.append(line)
+            import readline  # noqa: F401 - enables line editing for input()
+        except ImportError:
+            pass
+        
+        lines = []
+        empty_count = 0
+        
+        while empty_count < 1:
+            try:
+                line = input()
+                if line == "":
+                    empty_count += 1
+                else:
+                    empty_count = 0
+                    lines.append(line)
+            except EOFError:
+                break
+        
+        requirement = "\n".join(lines)
+        
+        if not requirement.strip():
+            print("❌ No requirement provided", file=sys.stderr)
+            return 1
+        
+        # Get format preference
+        print()
+        print("Select output format:")
+        print("  1. Gherkin/BDD (default)")
+        print("  2. Python pytest")
+        print("  3. Java TestNG")
+        print("  4. Plain text")
+        print("  5. JSON")
+        
+        try:
+            choice = input("\nChoice [1]: ")
         except EOFError:
-            break
-    
-    requirement = "\n".join(lines)
+            choice = ""
     
-    if not requirement.strip():
-        print("❌ No requirement provided", file=sys.stderr)
-        return 1
-    
-    # Get format preference
-    print()
-    print("Select output format:")
-    print("  1. Gherkin/BDD (default)")
-    print("  2. Python pytest")
-    print("  3. Java TestNG")
-    print("  4. Plain text")
-    print("  5. JSON")
-    
-    try:
-        choice = input("\nChoice [1]: ").strip() or "1"
-        formats = {"1": "gherkin", "2": "pytest", "3": "testng", "4": "plain", "5": "json"}
-        output_format = formats.get(choice, "gherkin")
-    except EOFError:
-        output_format = "gherkin"
+    output_format = formats.get(choice.strip() or "1", "gherkin")
     
     print()
     print("🧠 Generating test cases...")
     print()
     
     try:
+        from .generator import TestCaseGenerator
         generator = TestCaseGenerator()
         result = generator.generate(
             requirement=requirement,
@@ -218,7 +360,7 @@ def cmd_analyze(args) -> int:
         print(f"❌ Error: Input file not found: {args.input}", file=sys.stderr)
         return 1
     
-    requirement = input_path.read_text()
+    requirement = _read_text_fast(input_path)
     
     print("🔍 Analyzing requirement for edge cases...")
     print()
@@ -239,10 +381,13 @@ def cmd_analyze(args) -> int:
     return 0
 
 
-def main() -> int:
+def main(argv: Optional[List[str]] = None) -> int:
     """Main entry point."""
-    parser = create_parser()
-    args = parser.parse_args()
+    if argv is None:
+        argv = sys.argv[1:]
+    
+    parser = create_parser(argv)
+    args = parser.parse_args(argv)
     
     if args.command is None:
         parser.print_help()
@@ -4,8 +4,11 @@ Edge Case Analyzer
 Automatically detect potential edge cases from requirements.
 """
 
+import hashlib
 import re
-from typing import List, Dict, Set
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Set, Tuple, Union
 
 
 class EdgeCaseAnalyzer:
@@ -127,15 +130,74 @@ class EdgeCaseAnalyzer:
         ],
     }
     
+    # (category, cases) for each pattern, indexed by its group number below.
+    # Each pattern is its own category, named after its first keyword.
+    _GROUPS: List[Tuple[str, Tuple[str, ...]]] = [
+        (pattern.split("|")[0].replace(r"\\", "").title(), tuple(cases))
+        for pattern, cases in PATTERNS.items()
+    ]
+    
+    # All patterns fused into one regex so the requirement is scanned once.
+    # Each pattern sits in its own named group inside a lookahead, so a match
+    # never consumes text that another pattern could also match.
+    _MATCHER: "re.Pattern[str]" = re.compile(
+        "(?=" + "|".join(f"(?P<g{i}>{p})" for i, p in enumerate(PATTERNS)) + ")",
+        re.IGNORECASE,
+    )
+    
+    # Patterns are plain keyword alternations, so nothing shorter than the
+    # shortest keyword can match
+    _MIN_KEYWORD_LENGTH: int = min(
+        len(keyword) for pattern in PATTERNS for keyword in pattern.split("|")
+    )
+    
     # Universal edge cases that apply to most scenarios
-    UNIVERSAL_EDGE_CASES: List[str] = [
+    UNIVERSAL_EDGE_CASES: Tuple[str, ...] = (
         "Concurrent user actions",
         "Browser back button",
         "Page refresh during operation",
         "Multiple rapid clicks",
         "Mobile device viewport",
         "Screen reader accessibility",
-    ]
+    )
+    
+    # Match results shared by all analyzers, keyed by requirement text
+    # (or its SHA-256 digest for long requirements)
+    CACHE_SIZE: int = 256
+    HASH_THRESHOLD: int = 4096
+    _cache: "OrderedDict[Union[str, bytes], Tuple[int, ...]]" = OrderedDict()
+    _cache_lock = threading.Lock()
+    
+    def _match_groups(self, requirement: str) -> Tuple[int, ...]:
+        """Return the indices of all patterns found in the requirement, in order."""
+        if len(requirement) < self._MIN_KEYWORD_LENGTH:
+            return ()
+        
+        key: Union[str, bytes] = requirement
+        if len(requirement) > self.HASH_THRESHOLD:
+            key = hashlib.sha256(requirement.encode("utf-8")).digest()
+        
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached
+        
+        matched = {int(m.lastgroup[1:]) for m in self._MATCHER.finditer(requirement)}
+        result = tuple(sorted(matched))
+        
+        with self._cache_lock:
+            self._cache[key] = result
+            if len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+        
+        return result
+    
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop all cached match results."""
+        with cls._cache_lock:
+            cls._cache.clear()
     
     def analyze(self, requirement: str) -> List[str]:
         """
@@ -147,19 +209,17 @@ class EdgeCaseAnalyzer:
         Returns:
             List of potential edge cases
         """
-        requirement_lower = requirement.lower()
         edge_cases: Set[str] = set()
         
-        # Check each pattern
-        for pattern, cases in self.PATTERNS.items():
-            if re.search(pattern, requirement_lower):
-                edge_cases.update(cases)
+        # Check all patterns in a single pass
+        for index in self._match_groups(requirement):
+            edge_cases.update(self._GROUPS[index][1])
         
         # Add universal edge cases
         edge_cases.update(self.UNIVERSAL_EDGE_CASES)
         
         # Sort for consistent output
-        return sorted(list(edge_cases))
+        return sorted(edge_cases)
     
     def analyze_with_categories(self, requirement: str) -> Dict[str, List[str]]:
         """
@@ -171,18 +231,12 @@ class EdgeCaseAnalyzer:
         Returns:
             Dictionary of category -> edge cases
         """
-        requirement_lower = requirement.lower()
-        categorized: Dict[str, List[str]] = {}
-        
-        for pattern, cases in self.PATTERNS.items():
-            if re.search(pattern, requirement_lower):
-                # Extract category name from pattern
-                category = pattern.split("|")[0].replace(r"\\", "").title()
-                if category not in categorized:
-                    categorized[category] = []
-                categorized[category].extend(cases)
-        
-        categorized["Universal"] = self.UNIVERSAL_EDGE_CASES
+        groups = self._GROUPS
+        categorized: Dict[str, List[str]] = {
+            groups[index][0]: list(groups[index][1])
+            for index in self._match_groups(requirement)
+        }
+        categorized["Universal"] = list(self.UNIVERSAL_EDGE_CASES)
         
         return categorized
 
@@ -4,8 +4,11 @@ Output Formatters
 Format generated test cases into various output formats.
 """
 
+import io
 import json
-from typing import List, Dict, Any
+import re
+from functools import lru_cache
+from typing import IO, List, Dict, Any, Optional
 from pathlib import Path
 
 # Try to import Jinja2 for template rendering
@@ -15,6 +18,45 @@ try:
 except ImportError:
     JINJA_AVAILABLE = False
 
+# Try to import orjson for faster JSON output
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Case conversion patterns
+_RE_NONWORD = re.compile(r'[^\w\s]')
+_RE_SPACES = re.compile(r'\s+')
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize to indented JSON, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    # Match orjson's output: non-ASCII characters are written as-is
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
+@lru_cache(maxsize=512)
+def _snake_case(text: str) -> str:
+    """Convert text to snake_case (cached, names recur across formats)."""
+    return _RE_SPACES.sub('_', _RE_NONWORD.sub('', text).strip().lower())
+
+
+@lru_cache(maxsize=512)
+def _camel_case(text: str) -> str:
+    """Convert text to camelCase."""
+    words = _snake_case(text).split('_')
+    return words[0] + ''.join(word.capitalize() for word in words[1:])
+
+
+@lru_cache(maxsize=512)
+def _pascal_case(text: str) -> str:
+    """Convert text to PascalCase."""
+    words = _snake_case(text).split('_')
+    return ''.join(word.capitalize() for word in words)
+
 
 class TestCaseFormatter:
     """Format test cases into various output formats."""
@@ -39,8 +81,9 @@ class TestCaseFormatter:
         self,
         test_cases: List[Dict[str, Any]],
         output_format: str = "gherkin",
-        feature_name: str = "Feature"
-    ) -> str:
+        feature_name: str = "Feature",
+        out: Optional[IO[str]] = None
+    ) -> Optional[str]:
         """
         Format test cases into the specified format.
         
@@ -48,181 +91,164 @@ class TestCaseFormatter:
             test_cases: List of test case dictionaries
             output_format: Target format
             feature_name: Name of the feature (for Gherkin)
+            out: Optional text stream to write to instead of building a string
             
         Returns:
-            Formatted test cases as string
+            Formatted test cases as string, or None when written to out
         """
         if output_format not in self.SUPPORTED_FORMATS:
             raise ValueError(f"Unsupported format: {output_format}. Use one of {self.SUPPORTED_FORMATS}")
         
+        if output_format == "json" and out is None:
+            return _dumps(self._json_document(test_cases, feature_name))
+        
         formatter_method = getattr(self, f"_format_{output_format}")
-        return formatter_method(test_cases, feature_name)
+        if out is not None:
+            formatter_method(test_cases, feature_name, out)
+            return None
+        
+        buf = io.StringIO()
+        formatter_method(test_cases, feature_name, buf)
+        return buf.getvalue()
     
-    def _format_gherkin(self, test_cases: List[Dict[str, Any]], feature_name: str) -> str:
+    def _format_gherkin(self, test_cases: List[Dict[str, Any]], feature_name: str, out: IO[str]) -> None:
         """Format as Gherkin/BDD."""
-        lines = [f"Feature: {feature_name}", ""]
+        w = out.write
+        w(f"Feature: {feature_name}\n")
         
         for tc in test_cases:
-            lines.append(f"  Scenario: {tc.get('name', 'Unnamed Scenario')}")
+            w(f"\n  Scenario: {tc.get('name', 'Unnamed Scenario')}\n")
             
             # Given steps
             for given in tc.get("given", []):
-                lines.append(f"    Given {given}")
+                w(f"    Given {given}\n")
             
             # When steps
             for when in tc.get("when", []):
-                lines.append(f"    When {when}")
+                w(f"    When {when}\n")
             
             # Then steps
             for then in tc.get("then", []):
-                lines.append(f"    Then {then}")
-            
-            lines.append("")
-        
-        return "\n".join(lines)
+                w(f"    Then {then}\n")
     
-    def _format_pytest(self, test_cases: List[Dict[str, Any]], feature_name: str) -> str:
+    def _format_pytest(self, test_cases: List[Dict[str, Any]], feature_name: str, out: IO[str]) -> None:
         """Format as Python pytest."""
-        lines = [
-            '"""',
-            f'Test cases for {feature_name}',
-            '"""',
-            '',
-            'import pytest',
-            '',
-            ''
-        ]
+        w = out.write
+        w(f'"""\nTest cases for {feature_name}\n"""\n\nimport pytest\n\n')
         
         for tc in test_cases:
             func_name = self._to_snake_case(tc.get("name", "unnamed"))
-            lines.append(f"def test_{func_name}():")
-            lines.append(f'    """')
-            lines.append(f'    {tc.get("name", "Unnamed test")}')
-            lines.append(f'    """')
-            lines.append("    # Arrange")
+            w(f"\ndef test_{func_name}():\n")
+            w(f'    """\n    {tc.get("name", "Unnamed test")}\n    """\n')
+            w("    # Arrange\n")
             
             for given in tc.get("given", ["# Setup preconditions"]):
-                lines.append(f"    # {given}")
+                w(f"    # {given}\n")
             
-            lines.append("")
-            lines.append("    # Act")
+            w("\n    # Act\n")
             
             for when in tc.get("when", ["# Perform action"]):
-                lines.append(f"    # {when}")
+                w(f"    # {when}\n")
             
-            lines.append("")
-            lines.append("    # Assert")
+            w("\n    # Assert\n")
             
             for then in tc.get("then", ["# Verify result"]):
-                lines.append(f"    # {then}")
+                w(f"    # {then}\n")
             
-            lines.append("    assert True  # TODO: Implement assertion")
-            lines.append("")
-            lines.append("")
-        
-        return "\n".join(lines)
+            w("    assert True  # TODO: Implement assertion\n\n")
     
-    def _format_testng(self, test_cases: List[Dict[str, Any]], feature_name: str) -> str:
+    def _format_testng(self, test_cases: List[Dict[str, Any]], feature_name: str, out: IO[str]) -> None:
         """Format as Java TestNG."""
         class_name = self._to_pascal_case(feature_name)
         
-        lines = [
-            "import org.testng.Assert;",
-            "import org.testng.annotations.Test;",
-            "",
-            f"public class {class_name}Test {{",
-            ""
-        ]
+        w = out.write
+        w("import org.testng.Assert;\n")
+        w("import org.testng.annotations.Test;\n")
+        w(f"\npublic class {class_name}Test {{\n\n")
         
         for tc in test_cases:
-            method_name = self._to_camel_case(tc.get("name", "unnamed"))
-            lines.append("    @Test")
-            lines.append(f"    public void test{self._to_pascal_case(tc.get('name', 'Unnamed'))}() {{")
-            lines.append(f"        // {tc.get('name', 'Unnamed test')}")
-            lines.append("")
-            lines.append("        // Arrange")
+            w("    @Test\n")
+            w(f"    public void test{self._to_pascal_case(tc.get('name', 'Unnamed'))}() {{\n")
+            w(f"        // {tc.get('name', 'Unnamed test')}\n")
+            w("\n        // Arrange\n")
             
             for given in tc.get("given", []):
-                lines.append(f"        // {given}")
+                w(f"        // {given}\n")
             
-            lines.append("")
-            lines.append("        // Act")
+            w("\n        // Act\n")
             
             for when in tc.get("when", []):
-                lines.append(f"        // {when}")
+                w(f"        // {when}\n")
             
-            lines.append("")
-            lines.append("        // Assert")
+            w("\n        // Assert\n")
             
             for then in tc.get("then", []):
-                lines.append(f"        // {then}")
+                w(f"        // {then}\n")
             
-            lines.append("        Assert.assertTrue(true); // TODO: Implement")
-            lines.append("    }")
-            lines.append("")
-        
-        lines.append("}")
+            w("        Assert.assertTrue(true); // TODO: Implement\n")
+            w("    }\n\n")
         
-        return "\n".join(lines)
+        w("}")
     
-    def _format_plain(self, test_cases: List[Dict[str, Any]], feature_name: str) -> str:
+    def _format_plain(self, test_cases: List[Dict[str, Any]], feature_name: str, out: IO[str]) -> None:
         """Format as plain text."""
-        lines = [
-            f"Test Cases for: {feature_name}",
-            "=" * 50,
-            ""
-        ]
+        w = out.write
+        w(f"Test Cases for: {feature_name}\n")
+        w("=" * 50 + "\n")
         
         for i, tc in enumerate(test_cases, 1):
-            lines.append(f"Test Case #{i}: {tc.get('name', 'Unnamed')}")
-            lines.append("-" * 40)
+            w(f"\nTest Case #{i}: {tc.get('name', 'Unnamed')}\n")
+            w("-" * 40 + "\n")
             
             if tc.get("given"):
-                lines.append("Preconditions:")
+                w("Preconditions:\n")
                 for given in tc["given"]:
-                    lines.append(f"  • {given}")
+                    w(f"  • {given}\n")
             
             if tc.get("when"):
-                lines.append("Steps:")
+                w("Steps:\n")
                 for j, when in enumerate(tc["when"], 1):
-                    lines.append(f"  {j}. {when}")
+                    w(f"  {j}. {when}\n")
             
             if tc.get("then"):
-                lines.append("Expected Results:")
+                w("Expected Results:\n")
                 for then in tc["then"]:
-                    lines.append(f"  ✓ {then}")
-            
-            lines.append("")
-        
-        return "\n".join(lines)
+                    w(f"  ✓ {then}\n")
     
-    def _format_json(self, test_cases: List[Dict[str, Any]], feature_name: str) -> str:
-        """Format as JSON."""
-        output = {
+    @staticmethod
+    def _json_document(test_cases: List[Dict[str, Any]], feature_name: str) -> Dict[str, Any]:
+        """Build the document serialized by the JSON format."""
+        return {
             "feature": feature_name,
             "test_cases": test_cases
         }
-        return json.dumps(output, indent=2)
+    
+    def _format_json(self, test_cases: List[Dict[str, Any]], feature_name: str, out: IO[str]) -> None:
+        """Format as JSON."""
+        # json.dump writes chunk by chunk, so the document is never built in
+        # full; orjson (which always builds it) is only used by format() when
+        # returning a string
+        json.dump(self._json_document(test_cases, feature_name), out, indent=2, ensure_ascii=False)
     
     def _to_snake_case(self, text: str) -> str:
         """Convert text to snake_case."""
-        import re
-        text = re.sub(r'[^\w\s]', '', text)
-        text = re.sub(r'\s+', '_', text.strip().lower())
-        return text
+        return _snake_case(text)
     
     def _to_camel_case(self, text: str) -> str:
         """Convert text to camelCase."""
-        words = self._to_snake_case(text).split('_')
-        return words[0] + ''.join(word.capitalize() for word in words[1:])
+        return _camel_case(text)
     
     def _to_pascal_case(self, text: str) -> str:
         """Convert text to PascalCase."""
-        words = self._to_snake_case(text).split('_')
-        return ''.join(word.capitalize() for word in words)
+        return _pascal_case(text)
 
 
-def format_output(test_cases: List[Dict[str, Any]], output_format: str, feature_name: str = "Feature") -> str:
+def format_output(
+    test_cases: List[Dict[str, Any]],
+    output_format: str,
+    feature_name: str = "Feature",
+    out: Optional[IO[str]] = None
+) -> Optional[str]:
     """
     Convenience function to format test cases.
     
@@ -230,10 +256,11 @@ def format_output(test_cases: List[Dict[str, Any]], output_format: str, feature_
         test_cases: List of test case dictionaries
         output_format: Target format
         feature_name: Name of the feature
+        out: Optional text stream to write to
         
     Returns:
-        Formatted string
+        Formatted string, or None when written to out
     """
     formatter = TestCaseFormatter()
-    return formatter.format(test_cases, output_format, feature_name)
+    return formatter.format(test_cases, output_format, feature_name, out)
 
@@ -4,30 +4,131 @@ AI Test Case Generator
 Generate comprehensive test cases from user stories and requirements using LLMs.
 """
 
+import hashlib
+import json
 import os
-from typing import Optional, List, Dict, Any
-from dotenv import load_dotenv
-import google.generativeai as genai
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional, List, Dict, Any, Mapping
 
+from .cache import DiskCache, LLMCache, SemanticCache
 from .edge_cases import EdgeCaseAnalyzer
 from .formatters import format_output
 
-load_dotenv()
 
-# Configure Gemini
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
+@lru_cache(maxsize=None)
+def _load_genai():
+    """
+    Import and configure the Gemini SDK on first use.
+    
+    The SDK and its transitive imports are slow to load, so they are kept
+    off the import path of commands that never call the LLM.
+    """
+    import google.generativeai as genai
+    from dotenv import load_dotenv
+    
+    load_dotenv()
+    
+    # Configure Gemini
+    api_key = os.getenv("GEMINI_API_KEY")
+    if api_key:
+        genai.configure(api_key=api_key)
+    
+    return genai
+
+
+def gemini_embed(text: str, model: str = "models/text-embedding-004") -> List[float]:
+    """Embed text with Gemini, for use with SemanticCache."""
+    return _load_genai().embed_content(model=model, content=text)["embedding"]
 
 
 class TestCaseGenerator:
     """Generate test cases from requirements using LLMs."""
     
+    # Format-specific prompt instructions (read-only)
+    _FORMAT_INSTRUCTIONS: Mapping[str, str] = MappingProxyType({
+        "gherkin": """Use Gherkin/BDD format:
+Feature: [Feature Name]
+  Scenario: [Scenario Name]
+    Given [precondition]
+    When [action]
+    Then [expected result]""",
+        
+        "pytest": """Use Python pytest format:
+def test_scenario_name():
+    # Arrange
+    ...
+    # Act
+    ...
+    # Assert
+    assert ...""",
+        
+        "testng": """Use Java TestNG format:
+@Test
+public void testScenarioName() {
+    // Arrange
+    // Act
+    // Assert
+}""",
+        
+        "plain": """Use plain text format:
+Test Case: [Name]
+Preconditions: [Setup required]
+Steps:
+1. [Step 1]
+2. [Step 2]
+Expected Result: [What should happen]""",
+        
+        "json": """Use JSON format:
+{
+  "test_cases": [
+    {
+      "name": "...",
+      "preconditions": "...",
+      "steps": ["...", "..."],
+      "expected_result": "..."
+    }
+  ]
+}"""
+    })
+    
+    # Marks the start of each requirement's section in a batched prompt/response
+    BATCH_MARKER = "===REQ_{index}==="
+    # Tolerates Markdown emphasis/heading/code wrapped around the marker (e.g. **===REQ_3===**)
+    _BATCH_SPLIT = re.compile(r"^[ \t]*[*#`_]*[ \t]*===REQ_(\d+)===[ \t]*[*`_]*[ \t]*$", re.MULTILINE)
+    
+    # Requirements per batched call, so max_tokens is not spread over too many
+    BATCH_SIZE = 5
+    
+    # Rough characters-per-token ratio used to size prompts without a tokenizer
+    CHARS_PER_TOKEN = 4
+    
+    # Scenario header per format, used to drop duplicates when merging chunked responses
+    _SCENARIO_HEADERS: Mapping[str, "re.Pattern[str]"] = MappingProxyType({
+        "gherkin": re.compile(r"^[ \t]*Scenario(?: Outline)?:[ \t]*(.+?)[ \t]*$", re.MULTILINE),
+        "pytest": re.compile(r"^def (test_\w+)\(", re.MULTILINE),
+        "plain": re.compile(r"^[ \t]*Test Case:[ \t]*(.+?)[ \t]*$", re.MULTILINE),
+    })
+    
+    # Markdown code fence lines (```gherkin, ```), removed before merging responses
+    _CODE_FENCE = re.compile(r"^[ \t]*```[\w+-]*[ \t]*(?:\n|$)", re.MULTILINE)
+    
+    # Decorator, tag or comment lines that belong to the scenario header below them
+    _ATTACHED_LINE = re.compile(r"^[ \t]*[@#]")
+    _IMPORT_LINE = re.compile(r"^(?:import|from)\s")
+    
     def __init__(
         self,
         model: str = "gemini-2.0-flash",
         temperature: float = 0.7,
-        max_tokens: int = 4000
+        max_tokens: int = 4000,
+        cache: Optional[LLMCache] = None,
+        use_cache: bool = True,
+        semantic_cache: Optional[SemanticCache] = None,
+        max_input_tokens: int = 100000,
+        max_workers: int = 4
     ):
         """
         Initialize the test case generator.
@@ -36,12 +137,25 @@ class TestCaseGenerator:
             model: The LLM model to use
             temperature: Creativity level (0-1)
             max_tokens: Maximum output tokens
+            cache: Response cache backend (default: on-disk JSON cache)
+            use_cache: Whether to cache responses (only applies at temperature 0)
+            semantic_cache: Optional cache that reuses responses for reworded requirements
+            max_input_tokens: Approximate prompt size above which the requirement
+                is split into chunks that are generated separately
+            max_workers: Maximum concurrent LLM calls when generating chunks
         """
         self.model_name = model
         self.temperature = temperature
         self.max_tokens = max_tokens
-        self.model = genai.GenerativeModel(model)
+        self._genai = _load_genai()
+        self.model = self._genai.GenerativeModel(model)
         self.edge_analyzer = EdgeCaseAnalyzer()
+        self.cache: Optional[LLMCache] = None
+        if use_cache:
+            self.cache = cache if cache is not None else DiskCache()
+        self.semantic_cache = semantic_cache
+        self.max_input_tokens = max_input_tokens
+        self.max_workers = max_workers
     
     def generate(
         self,
@@ -78,17 +192,345 @@ class TestCaseGenerator:
             edge_cases=edge_cases
         )
         
+        # Oversized prompts are split rather than sent (and billed) as-is
+        if len(prompt) // self.CHARS_PER_TOKEN > self.max_input_tokens:
+            return self._generate_chunked(
+                requirement=requirement,
+                output_format=output_format,
+                context=context,
+                num_cases=num_cases,
+                include_edge_cases=include_edge_cases,
+                overhead=len(prompt) - len(requirement)
+            )
+        
+        # Only deterministic (temperature 0) responses are worth reusing
+        cache_key = None
+        if self.cache is not None and self.temperature == 0:
+            cache_key = self._cache_key(prompt)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        # Fall back to a near-duplicate requirement generated with the same settings
+        if self.semantic_cache is not None:
+            bucket = self.semantic_cache.bucket(
+                self.model_name, self.temperature, self.max_tokens,
+                output_format, context, num_cases, include_edge_cases
+            )
+            query = self.semantic_cache.embed(requirement)
+            cached = self.semantic_cache.get(query, bucket)
+            if cached is not None:
+                return cached
+        
         # Generate with Gemini
+        text = self._call_model(prompt)
+        
+        if cache_key is not None:
+            self.cache.set(cache_key, text)
+        if self.semantic_cache is not None:
+            self.semantic_cache.add(query, bucket, text)
+        
+        return text
+    
+    def generate_batch(
+        self,
+        requirements: List[str],
+        output_format: str = "gherkin",
+        num_cases_each: int = 10,
+        include_edge_cases: bool = True,
+        batch_size: Optional[int] = None
+    ) -> List[str]:
+        """
+        Generate test cases for several requirements with few LLM calls.
+        
+        Requirements are packed into groups of up to batch_size whose prompt
+        fits max_input_tokens, and each group is sent as one prompt, which
+        saves the round-trip and shared instructions per requirement. Groups
+        run concurrently. A requirement whose section the model truncated,
+        skipped or mis-marked is generated again on its own.
+        
+        Args:
+            requirements: The user stories or requirement texts
+            output_format: Output format (gherkin, pytest, testng, plain, json)
+            num_cases_each: Target number of test cases per requirement
+            include_edge_cases: Whether to include edge cases
+            batch_size: Maximum requirements per call (default: BATCH_SIZE)
+            
+        Returns:
+            Generated test cases for each requirement, in input order
+            (an empty string only if the model returned nothing for it alone)
+        """
+        if not requirements:
+            return []
+        
+        edge_cases = [
+            self.edge_analyzer.analyze(requirement) if include_edge_cases else []
+            for requirement in requirements
+        ]
+        groups = self._batch_groups(requirements, output_format, num_cases_each, edge_cases, batch_size or self.BATCH_SIZE)
+        
+        def generate_group(group: List[int]) -> List[str]:
+            sections = [""] * len(group)
+            if len(group) > 1:
+                prompt = self._build_batch_prompt(
+                    [requirements[i] for i in group], output_format, num_cases_each,
+                    [edge_cases[i] for i in group]
+                )
+                sections = self._split_batch_response(self._complete(prompt), len(group))
+            
+            return [
+                section or self.generate(
+                    requirements[i],
+                    output_format=output_format,
+                    num_cases=num_cases_each,
+                    include_edge_cases=include_edge_cases
+                )
+                for i, section in zip(group, sections)
+            ]
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(groups))) as executor:
+            return [section for sections in executor.map(generate_group, groups) for section in sections]
+    
+    def _batch_groups(
+        self,
+        requirements: List[str],
+        output_format: str,
+        num_cases: int,
+        edge_cases: List[List[str]],
+        batch_size: int
+    ) -> List[List[int]]:
+        """Split requirement indices into consecutive groups that fit batch_size and max_input_tokens."""
+        groups: List[List[int]] = []
+        current: List[int] = []
+        
+        def fits(group: List[int]) -> bool:
+            if len(group) > batch_size:
+                return False
+            prompt = self._build_batch_prompt(
+                [requirements[i] for i in group], output_format, num_cases,
+                [edge_cases[i] for i in group]
+            )
+            return len(prompt) // self.CHARS_PER_TOKEN <= self.max_input_tokens
+        
+        for index in range(len(requirements)):
+            if current and not fits(current + [index]):
+                groups.append(current)
+                current = []
+            current.append(index)
+        
+        groups.append(current)
+        return groups
+    
+    def _generate_chunked(
+        self,
+        requirement: str,
+        output_format: str,
+        context: Optional[str],
+        num_cases: int,
+        include_edge_cases: bool,
+        overhead: int
+    ) -> str:
+        """
+        Generate test cases for an oversized requirement chunk by chunk.
+        
+        The requirement is split on paragraph boundaries into chunks that fit
+        max_input_tokens, the chunks are generated concurrently, and the
+        responses are merged with duplicate scenarios removed.
+        """
+        budget = self.max_input_tokens * self.CHARS_PER_TOKEN - overhead
+        if budget <= 0:
+            raise ValueError(
+                "Prompt exceeds max_input_tokens even without the requirement; "
+                "shorten the context or raise max_input_tokens"
+            )
+        
+        chunks = self._split_requirement(requirement, budget)
+        cases_per_chunk = max(1, -(-num_cases // len(chunks)))
+        
+        def generate_chunk(chunk: str) -> str:
+            edge_cases = self.edge_analyzer.analyze(chunk) if include_edge_cases else []
+            prompt = self._build_prompt(
+                requirement=chunk,
+                output_format=output_format,
+                context=context,
+                num_cases=cases_per_chunk,
+                edge_cases=edge_cases
+            )
+            return self._complete(prompt)
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunks))) as executor:
+            responses = list(executor.map(generate_chunk, chunks))
+        
+        return self._merge_responses(responses, output_format)
+    
+    @staticmethod
+    def _split_requirement(requirement: str, budget: int) -> List[str]:
+        """Split a requirement into chunks of at most budget characters, on paragraph boundaries."""
+        chunks: List[str] = []
+        current: List[str] = []
+        size = 0
+        
+        for paragraph in re.split(r"\n\s*\n", requirement):
+            # A single paragraph over budget is cut at the budget boundary
+            pieces = [paragraph[i:i + budget] for i in range(0, len(paragraph), budget)] or [""]
+            for piece in pieces:
+                added = len(piece) + (2 if current else 0)
+                if current and size + added > budget:
+                    chunks.append("\n\n".join(current))
+                    current, size = [], 0
+                    added = len(piece)
+                current.append(piece)
+                size += added
+        
+        if current:
+            chunks.append("\n\n".join(current))
+        return chunks
+    
+    def _merge_responses(self, responses: List[str], output_format: str) -> str:
+        """Concatenate chunk responses, dropping scenarios whose name was already generated."""
+        responses = [self._CODE_FENCE.sub("", response) for response in responses]
+        if output_format == "json":
+            return self._merge_json_responses(responses)
+        
+        header = self._SCENARIO_HEADERS.get(output_format)
+        if header is None:
+            return "\n\n".join(response.strip() for response in responses)
+        
+        seen = set()
+        preambles: List[str] = []
+        scenarios: List[str] = []
+        
+        for response in responses:
+            matches = list(header.finditer(response))
+            if not matches:
+                scenarios.append(response.strip())
+                continue
+            
+            # Each scenario starts at the decorators/tags/comments directly above its header
+            starts = [
+                self._attached_start(response, previous.end() if previous else 0, match.start())
+                for previous, match in zip([None] + matches[:-1], matches)
+            ]
+            preambles.append(response[:starts[0]])
+            
+            for match, start, end in zip(matches, starts, starts[1:] + [len(response)]):
+                name = match.group(1).strip().lower()
+                if name in seen:
+                    continue
+                seen.add(name)
+                scenarios.append(response[start:end].strip("\n"))
+        
+        # A feature file allows a single Feature/Background, so Gherkin keeps
+        # the first preamble; code keeps every chunk's imports and fixtures
+        if output_format == "gherkin":
+            preamble = preambles[:1]
+        else:
+            preamble = self._merge_preambles(preambles)
+        
+        separator = "\n\n\n" if output_format == "pytest" else "\n\n"
+        return separator.join(part for part in preamble + scenarios if part)
+    
+    @classmethod
+    def _attached_start(cls, response: str, lower: int, header_start: int) -> int:
+        """
+        Find where the lines attached to a scenario header begin.
+        
+        Attached lines are the decorators (including multi-line ones), tags
+        and comments directly above the header, after position lower.
+        """
+        lines = response[lower:header_start].splitlines(keepends=True)
+        offset = lower
+        
+        for i, line in enumerate(lines):
+            if cls._ATTACHED_LINE.match(line):
+                depth = 0
+                for attached in lines[i:]:
+                    if depth <= 0 and not cls._ATTACHED_LINE.match(attached):
+                        break
+                    depth += sum(map(attached.count, "([{")) - sum(map(attached.count, ")]}"))
+                else:
+                    if depth <= 0:
+                        return offset
+            offset += len(line)
+        
+        return header_start
+    
+    @classmethod
+    def _merge_preambles(cls, preambles: List[str]) -> List[str]:
+        """Merge chunk preambles: imports line by line, other blocks (fixtures, ...) whole."""
+        imports: List[str] = []
+        blocks: List[str] = []
+        
+        for preamble in preambles:
+            for block in re.split(r"\n[ \t]*\n", preamble.strip("\n")):
+                lines = [line for line in block.splitlines() if line.strip()]
+                if lines and all(cls._IMPORT_LINE.match(line) for line in lines):
+                    imports.extend(line for line in lines if line not in imports)
+                elif block.strip() and block.strip("\n") not in blocks:
+                    blocks.append(block.strip("\n"))
+        
+        return (["\n".join(imports)] if imports else []) + blocks
+    
+    @staticmethod
+    def _merge_json_responses(responses: List[str]) -> str:
+        """Combine the test_cases arrays of JSON chunk responses into one document."""
+        seen = set()
+        test_cases: List[Any] = []
+        
+        for response in responses:
+            try:
+                cases = json.loads(response).get("test_cases", [])
+            except (ValueError, AttributeError):
+                # Not the requested shape: keep the raw text rather than drop it
+                return "\n\n".join(response.strip() for response in responses)
+            
+            for case in cases:
+                name = str(case.get("name", "")).strip().lower() if isinstance(case, dict) else ""
+                if name and name in seen:
+                    continue
+                seen.add(name)
+                test_cases.append(case)
+        
+        return json.dumps({"test_cases": test_cases}, indent=2, ensure_ascii=False)
+    
+    def _complete(self, prompt: str) -> str:
+        """Return the model response for a prompt, using the response cache at temperature 0."""
+        cache_key = None
+        if self.cache is not None and self.temperature == 0:
+            cache_key = self._cache_key(prompt)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        text = self._call_model(prompt)
+        if cache_key is not None:
+            self.cache.set(cache_key, text)
+        return text
+    
+    def _call_model(self, prompt: str) -> str:
+        """Send a prompt to Gemini and return the response text."""
         response = self.model.generate_content(
             prompt,
-            generation_config=genai.GenerationConfig(
+            generation_config=self._genai.GenerationConfig(
                 temperature=self.temperature,
                 max_output_tokens=self.max_tokens
             )
         )
-        
         return response.text
     
+    def _cache_key(self, prompt: str) -> str:
+        """Build the cache key for a prompt and the current model settings."""
+        payload = json.dumps(
+            {
+                "model": self.model_name,
+                "prompt": prompt,
+                "temperature": self.temperature,
+                "max_tokens": self.max_tokens
+            },
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
     def generate_from_dict(self, data: Dict[str, Any]) -> str:
         """Generate test cases from a dictionary of requirement data."""
         requirement = data.get("requirement", "")
@@ -120,26 +562,25 @@ class TestCaseGenerator:
         
         format_instructions = self._get_format_instructions(output_format)
         
-        prompt = f"""You are an expert QA engineer. Generate comprehensive test cases for the following requirement.
+        parts = [f"""You are an expert QA engineer. Generate comprehensive test cases for the following requirement.
 
 ## Requirement:
 {requirement}
 
-"""
+"""]
         
         if context:
-            prompt += f"""## Additional Context:
+            parts.append(f"""## Additional Context:
 {context}
 
-"""
+""")
         
         if edge_cases:
-            prompt += f"""## Edge Cases to Consider:
-{chr(10).join(f'- {ec}' for ec in edge_cases)}
-
-"""
+            parts.append("## Edge Cases to Consider:\n")
+            parts.extend(f"- {ec}\n" for ec in edge_cases)
+            parts.append("\n")
         
-        prompt += f"""## Instructions:
+        parts.append(f"""## Instructions:
 1. Generate approximately {num_cases} test cases
 2. Cover both happy path and negative scenarios
 3. Include the edge cases listed above
@@ -150,60 +591,73 @@ class TestCaseGenerator:
 {format_instructions}
 
 Generate the test cases now:
-"""
+""")
         
-        return prompt
+        return "".join(parts)
     
-    def _get_format_instructions(self, output_format: str) -> str:
-        """Get format-specific instructions."""
+    def _build_batch_prompt(
+        self,
+        requirements: List[str],
+        output_format: str,
+        num_cases: int,
+        edge_cases: List[List[str]]
+    ) -> str:
+        """Build a single prompt covering several requirements."""
         
-        formats = {
-            "gherkin": """Use Gherkin/BDD format:
-Feature: [Feature Name]
-  Scenario: [Scenario Name]
-    Given [precondition]
-    When [action]
-    Then [expected result]""",
-            
-            "pytest": """Use Python pytest format:
-def test_scenario_name():
-    # Arrange
-    ...
-    # Act
-    ...
-    # Assert
-    assert ...""",
-            
-            "testng": """Use Java TestNG format:
-@Test
-public void testScenarioName() {
-    // Arrange
-    // Act
-    // Assert
-}""",
-            
-            "plain": """Use plain text format:
-Test Case: [Name]
-Preconditions: [Setup required]
-Steps:
-1. [Step 1]
-2. [Step 2]
-Expected Result: [What should happen]""",
-            
-            "json": """Use JSON format:
-{
-  "test_cases": [
-    {
-      "name": "...",
-      "preconditions": "...",
-      "steps": ["...", "..."],
-      "expected_result": "..."
-    }
-  ]
-}"""
-        }
+        format_instructions = self._get_format_instructions(output_format)
         
-        return formats.get(output_format, formats["plain"])
+        parts = [f"""You are an expert QA engineer. Generate comprehensive test cases for each of the following {len(requirements)} requirements.
+
+"""]
+        
+        for index, (requirement, cases) in enumerate(zip(requirements, edge_cases), 1):
+            parts.append(f"""{self.BATCH_MARKER.format(index=index)}
+## Requirement:
+{requirement}
+
+""")
+            if cases:
+                parts.append("## Edge Cases to Consider:\n")
+                parts.extend(f"- {ec}\n" for ec in cases)
+                parts.append("\n")
+        
+        parts.append(f"""## Instructions:
+1. Generate approximately {num_cases} test cases for each requirement
+2. Cover both happy path and negative scenarios
+3. Include the edge cases listed for each requirement
+4. Be specific with test data examples
+5. Consider boundary conditions
+6. Start each requirement's test cases with its marker line exactly as given
+   (e.g. {self.BATCH_MARKER.format(index=1)}) and output nothing else on that line
+
+## Output Format:
+{format_instructions}
+
+Generate the test cases now:
+""")
+        
+        return "".join(parts)
+    
+    def _split_batch_response(self, text: str, count: int) -> List[str]:
+        """Split a batched response into one section per requirement."""
+        sections = [""] * count
+        pieces = self._BATCH_SPLIT.split(text)
+        
+        # pieces = [preamble, index, body, index, body, ...]
+        for index, body in zip(pieces[1::2], pieces[2::2]):
+            position = int(index) - 1
+            if 0 <= position < count:
+                sections[position] = body.strip()
+        
+        return sections
+    
+    def _get_format_instructions(self, output_format: str) -> str:
+        """Get format-specific instructions."""
+        instructions = self._FORMAT_INSTRUCTIONS.get(output_format)
+        if instructions is None:
+            # Unknown formats fall back to plain text
+            instructions = self._FORMAT_INSTRUCTIONS["plain"]
+        return instructions
 
 
 def main():
@@ -4,15 +4,117 @@ Jira Integration Client
 Fetch requirements and user stories from Jira tickets.
 """
 
+import asyncio
+import email.utils
+import importlib.util
+import json
+import logging
 import os
-from typing import Optional, Dict, Any
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Iterator, List, Sequence, Tuple
 from dotenv import load_dotenv
 
+# Try to import orjson for faster response decoding
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# httpx is only needed for Jira integration
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
 load_dotenv()
 
+logger = logging.getLogger(__name__)
 
-class JiraClient:
-    """Client for interacting with Jira API."""
+# (connect, read) timeout in seconds for Jira API calls
+REQUEST_TIMEOUT = (5, 30)
+
+# Retry policy for rate-limited / transient server errors
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.3
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+MAX_RETRY_AFTER = 60
+
+# Custom fields holding acceptance criteria. Ids vary by Jira setup (on Jira
+# Cloud customfield_10016/10020 are usually story points and sprint), so none
+# are read unless JIRA_ACCEPTANCE_FIELDS lists them
+DEFAULT_ACCEPTANCE_FIELDS = ""
+
+# Results requested per JQL search page
+SEARCH_PAGE_SIZE = 50
+
+# Fields returned for each JQL search result
+SEARCH_FIELDS = ("summary", "description", "status", "issuetype")
+
+# Ticket keys per bulk "issueKey in (...)" search (keeps the JQL URL short)
+BULK_CHUNK_SIZE = 100
+
+# Jira issue key (project key, dash, number), e.g. PROJ-123
+TICKET_KEY = re.compile(r"[A-Za-z][A-Za-z0-9_]*-\d+")
+
+# HTTP/2 needs the optional h2 package
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# httpx decodes Brotli only with the optional brotli (or brotlicffi) package;
+# ADF's repetitive JSON compresses much better with br than with gzip
+BROTLI_AVAILABLE = any(
+    importlib.util.find_spec(name) is not None for name in ("brotli", "brotlicffi")
+)
+ACCEPT_ENCODING = "br, gzip, deflate" if BROTLI_AVAILABLE else "gzip, deflate"
+
+
+def _json(response) -> Any:
+    """Decode a JSON response body, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def _loads(content: bytes) -> Any:
+    """Decode a JSON document from raw bytes, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def _retry_delay(response, attempt: int) -> float:
+    """Get the wait before retrying: the server's Retry-After if given, else exponential backoff."""
+    retry_after = response.headers.get("Retry-After")
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            # HTTP-date form
+            try:
+                delay = email.utils.parsedate_to_datetime(retry_after).timestamp() - time.time()
+            except (TypeError, ValueError):
+                delay = None
+        if delay is not None:
+            return min(max(delay, 0.0), MAX_RETRY_AFTER)
+    return RETRY_BACKOFF * (2 ** attempt)
+
+
+class BaseJiraClient:
+    """Configuration and ticket parsing shared by the sync and async Jira clients."""
+    
+    # Parsed ADF text keyed by (Jira URL, ticket key, updated timestamp, field),
+    # shared by all clients so polling an unchanged ticket skips the re-parse
+    ADF_CACHE_SIZE: int = 1024
+    _adf_cache: "OrderedDict[Tuple[str, str, str, str], str]" = OrderedDict()
+    _adf_cache_lock = threading.Lock()
+    
+    # Tickets remembered per client for conditional (If-None-Match) requests
+    ETAG_CACHE_SIZE: int = 1024
     
     def __init__(
         self,
@@ -21,7 +123,7 @@ class JiraClient:
         api_token: Optional[str] = None
     ):
         """
-        Initialize the Jira client.
+        Resolve and validate Jira credentials.
         
         Args:
             url: Jira instance URL (e.g., https://company.atlassian.net)
@@ -31,66 +133,148 @@ class JiraClient:
         self.url = url or os.getenv("JIRA_URL")
         self.email = email or os.getenv("JIRA_EMAIL")
         self.api_token = api_token or os.getenv("JIRA_API_TOKEN")
+        self.acceptance_fields = tuple(
+            field.strip()
+            for field in os.getenv("JIRA_ACCEPTANCE_FIELDS", DEFAULT_ACCEPTANCE_FIELDS).split(",")
+            if field.strip()
+        )
         
-        if not all([self.url, self.email, self.api_token]):
+        # Fields fetched by default: only what the requirement text is built from
+        self.ticket_fields = ("summary", "description", "updated") + self.acceptance_fields
+        
+        if not (self.url and self.email and self.api_token):
             raise ValueError(
                 "Jira credentials not configured. Set JIRA_URL, JIRA_EMAIL, "
                 "and JIRA_API_TOKEN environment variables."
             )
         
-        # Lazy import requests
-        try:
-            import requests
-            self.requests = requests
-        except ImportError:
-            raise ImportError("requests library required for Jira integration: pip install requests")
-    
-    def _get_auth(self):
-        """Get authentication tuple."""
-        return (self.email, self.api_token)
-    
-    def _get_headers(self) -> Dict[str, str]:
-        """Get request headers."""
-        return {
+        if not HTTPX_AVAILABLE:
+            raise ImportError("httpx library required for Jira integration: pip install 'httpx[http2,brotli]'")
+        
+        # Built once and reused for every request
+        self._auth = (self.email, self.api_token)
+        self._headers = {
             "Accept": "application/json",
+            "Accept-Encoding": ACCEPT_ENCODING,
             "Content-Type": "application/json"
         }
+        self._default_ticket_params = {"fields": ",".join(self.ticket_fields)}
+        
+        # (ticket id, fields) -> (ETag, raw body) of the last 200 response. The
+        # body is kept as bytes so each 304 decodes a fresh dict that callers
+        # can modify without affecting later results
+        self._etag_cache: "OrderedDict[Tuple[str, str], Tuple[str, bytes]]" = OrderedDict()
+        self._etag_lock = threading.Lock()
+    
+    def _client_options(self) -> Dict[str, Any]:
+        """Get the keyword arguments shared by the httpx clients."""
+        return {
+            "base_url": self.url,
+            "auth": self._auth,
+            "headers": self._headers,
+            # requests followed redirects by default (e.g. http -> https, moved issues)
+            "follow_redirects": True,
+            "timeout": httpx.Timeout(REQUEST_TIMEOUT[1], connect=REQUEST_TIMEOUT[0])
+        }
+    
+    def _ticket_params(self, fields: Optional[Sequence[str]]) -> Dict[str, str]:
+        """Get query parameters restricting a ticket fetch to the given fields."""
+        if fields is None:
+            return self._default_ticket_params
+        return {"fields": ",".join(fields)}
+    
+    def _etag_entry(self, key: Tuple[str, str]) -> Optional[Tuple[str, bytes]]:
+        """Get the cached (ETag, raw body) for a ticket request, if any."""
+        with self._etag_lock:
+            return self._etag_cache.get(key)
     
-    def get_ticket(self, ticket_id: str) -> Dict[str, Any]:
+    def _read_ticket(
+        self,
+        response,
+        ticket_id: str,
+        key: Tuple[str, str],
+        entry: Optional[Tuple[str, bytes]]
+    ) -> Dict[str, Any]:
         """
-        Fetch a Jira ticket by ID.
+        Turn a ticket response into ticket data, using the cache on 304 Not Modified.
         
         Args:
-            ticket_id: The ticket ID (e.g., PROJ-123)
+            response: The httpx response
+            ticket_id: The ticket ID the response is for
+            key: Cache key of the request
+            entry: Cached (ETag, raw body) the request was conditional on
             
         Returns:
             Dictionary containing ticket data
         """
-        url = f"{self.url}/rest/api/3/issue/{ticket_id}"
-        
-        response = self.requests.get(
-            url,
-            headers=self._get_headers(),
-            auth=self._get_auth()
-        )
+        if response.status_code == 304 and entry is not None:
+            with self._etag_lock:
+                if key in self._etag_cache:
+                    self._etag_cache.move_to_end(key)
+            return _loads(entry[1])
         
         if response.status_code == 404:
             raise ValueError(f"Ticket not found: {ticket_id}")
         
         response.raise_for_status()
-        return response.json()
+        data = _json(response)
+        
+        etag = response.headers.get("ETag")
+        if etag:
+            with self._etag_lock:
+                self._etag_cache[key] = (etag, response.content)
+                self._etag_cache.move_to_end(key)
+                if len(self._etag_cache) > self.ETAG_CACHE_SIZE:
+                    self._etag_cache.popitem(last=False)
+        
+        return data
     
-    def get_ticket_description(self, ticket_id: str) -> str:
+    @staticmethod
+    def _search_params(
+        jql: str,
+        max_results: int,
+        start_at: int = 0,
+        fields: Sequence[str] = SEARCH_FIELDS,
+        validate: bool = True
+    ) -> Dict[str, Any]:
+        """Get query parameters for one page of a JQL search."""
+        params = {
+            "jql": jql,
+            "startAt": start_at,
+            "maxResults": max_results,
+            "fields": list(fields),
+            "expand": ""
+        }
+        if not validate:
+            # Unknown issue keys become warnings instead of a 400 error
+            params["validateQuery"] = "warn"
+        return params
+    
+    @staticmethod
+    def _bulk_queries(ticket_ids: Sequence[str]) -> List[Tuple[str, int]]:
+        """Split ticket IDs into (JQL "issueKey in (...)" query, key count) chunks."""
+        unique = list(dict.fromkeys(ticket_ids))
+        
+        # A stray space, comma or ")" would break or rewrite the whole chunk's query
+        for ticket_id in unique:
+            if not TICKET_KEY.fullmatch(ticket_id):
+                raise ValueError(f"Invalid ticket key: {ticket_id!r}")
+        
+        return [
+            ("issueKey in (" + ",".join(f'"{key}"' for key in chunk) + ")", len(chunk))
+            for chunk in (unique[i:i + BULK_CHUNK_SIZE] for i in range(0, len(unique), BULK_CHUNK_SIZE))
+        ]
+    
+    def _build_description(self, ticket: Dict[str, Any]) -> str:
         """
-        Get the description/requirement from a Jira ticket.
+        Build the requirement text from a ticket's fields.
         
         Args:
-            ticket_id: The ticket ID (e.g., PROJ-123)
+            ticket: Ticket data as returned by the Jira API
             
         Returns:
             The ticket description as a string
         """
-        ticket = self.get_ticket(ticket_id)
         fields = ticket.get("fields", {})
         
         # Build requirement string from various fields
@@ -106,20 +290,102 @@ class JiraClient:
         if description:
             # Handle Atlassian Document Format (ADF)
             if isinstance(description, dict):
-                description = self._parse_adf(description)
+                description = self._parse_field(ticket, "description", description)
             parts.append(f"\nDescription:\n{description}")
         
-        # Acceptance Criteria (custom field - may vary by Jira setup)
-        # Common custom field names: customfield_10016, customfield_10020, etc.
-        for field_key, field_value in fields.items():
-            if "acceptance" in field_key.lower() or "criteria" in field_key.lower():
-                if field_value:
-                    if isinstance(field_value, dict):
-                        field_value = self._parse_adf(field_value)
-                    parts.append(f"\nAcceptance Criteria:\n{field_value}")
+        # Acceptance Criteria (custom fields - set JIRA_ACCEPTANCE_FIELDS)
+        for field_key in self.acceptance_fields:
+            field_value = fields.get(field_key)
+            # Only text and ADF; numbers, option objects and lists are not criteria
+            if isinstance(field_value, dict) and field_value.get("type") == "doc":
+                field_value = self._parse_field(ticket, field_key, field_value)
+            elif not isinstance(field_value, str):
+                continue
+            if field_value:
+                parts.append(f"\nAcceptance Criteria:\n{field_value}")
         
         return "\n".join(parts)
     
+    def _parse_field(self, ticket: Dict[str, Any], field_key: str, adf: Dict[str, Any]) -> str:
+        """
+        Parse an ADF field, reusing the result while the ticket is unchanged.
+        
+        Args:
+            ticket: Ticket data the field belongs to
+            field_key: Name of the field
+            adf: ADF document structure
+            
+        Returns:
+            Plain text representation
+        """
+        updated = ticket.get("fields", {}).get("updated")
+        if not updated or "key" not in ticket:
+            return self._parse_adf(adf)
+        
+        key = (self.url, ticket["key"], updated, field_key)
+        with self._adf_cache_lock:
+            cached = self._adf_cache.get(key)
+            if cached is not None:
+                self._adf_cache.move_to_end(key)
+                return cached
+        
+        text = self._parse_adf(adf)
+        
+        with self._adf_cache_lock:
+            self._adf_cache[key] = text
+            if len(self._adf_cache) > self.ADF_CACHE_SIZE:
+                self._adf_cache.popitem(last=False)
+        
+        return text
+    
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop all cached ADF text."""
+        with cls._adf_cache_lock:
+            cls._adf_cache.clear()
+    
+    # Line prefixes written by the ADF handlers; headings are clamped to levels 1-6
+    _BULLET = "\n\u2022 "
+    _HEADING_PREFIX = ("\n# ", "\n# ", "\n## ", "\n### ", "\n#### ", "\n##### ", "\n###### ")
+    
+    def _adf_paragraph(self, block: Dict[str, Any], out: List[str]) -> None:
+        """Write a paragraph as one line."""
+        out.append("\n")
+        self._extract_text(block, out)
+    
+    def _adf_bullet_list(self, block: Dict[str, Any], out: List[str]) -> None:
+        """Write each list item as a bullet line."""
+        for item in block.get("content", []):
+            out.append(self._BULLET)
+            self._extract_text(item, out)
+    
+    def _adf_ordered_list(self, block: Dict[str, Any], out: List[str]) -> None:
+        """Write each list item as a numbered line."""
+        for i, item in enumerate(block.get("content", []), 1):
+            out.append(f"\n{i}. ")
+            self._extract_text(item, out)
+    
+    def _adf_heading(self, block: Dict[str, Any], out: List[str]) -> None:
+        """Write a heading as a Markdown-style '#' line."""
+        level = block.get("attrs", {}).get("level", 1)
+        out.append(self._HEADING_PREFIX[max(1, min(level, 6))])
+        self._extract_text(block, out)
+    
+    def _adf_code_block(self, block: Dict[str, Any], out: List[str]) -> None:
+        """Write a code block fenced with backticks."""
+        out.append("\n```\n")
+        self._extract_text(block, out)
+        out.append("\n```")
+    
+    # Top-level ADF block type -> handler writing its lines; other types are skipped
+    _ADF_HANDLERS = {
+        "paragraph": _adf_paragraph,
+        "bulletList": _adf_bullet_list,
+        "orderedList": _adf_ordered_list,
+        "heading": _adf_heading,
+        "codeBlock": _adf_code_block
+    }
+    
     def _parse_adf(self, adf: Dict[str, Any]) -> str:
         """
         Parse Atlassian Document Format to plain text.
@@ -133,78 +399,448 @@ class JiraClient:
         if not isinstance(adf, dict):
             return str(adf)
         
-        content = adf.get("content", [])
-        text_parts = []
+        # Every output line is written as "\n" + line into one buffer that is
+        # joined once; the leading newline is dropped at the end
+        out: List[str] = []
+        handlers = self._ADF_HANDLERS
         
-        for block in content:
-            block_type = block.get("type", "")
-            
-            if block_type == "paragraph":
-                para_text = self._extract_text(block)
-                text_parts.append(para_text)
+        for block in adf.get("content", []):
+            handler = handlers.get(block.get("type", ""))
+            if handler is not None:
+                handler(self, block, out)
+        
+        return "".join(out)[1:]
+    
+    @staticmethod
+    def _extract_text(block: Dict[str, Any], out: List[str]) -> None:
+        """Append the text content of an ADF block to out, depth-first without recursion."""
+        stack = list(reversed(block.get("content", [])))
+        
+        while stack:
+            item = stack.pop()
+            if item.get("type") == "text":
+                out.append(item.get("text", ""))
+            elif "content" in item:
+                stack.extend(reversed(item["content"]))
+
+
+class JiraClient(BaseJiraClient):
+    """Client for interacting with Jira API."""
+    
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        email: Optional[str] = None,
+        api_token: Optional[str] = None,
+        transport: Optional[Any] = None
+    ):
+        """
+        Initialize the Jira client.
+        
+        Args:
+            url: Jira instance URL (e.g., https://company.atlassian.net)
+            email: User email for authentication
+            api_token: API token for authentication
+            transport: Optional httpx transport (e.g. httpx.MockTransport in tests)
+        """
+        super().__init__(url, email, api_token)
+        
+        # One long-lived client: HTTP/2 multiplexes requests over a single
+        # TCP/TLS connection (falls back to HTTP/1.1 keep-alive without h2)
+        if transport is None:
+            transport = httpx.HTTPTransport(
+                http2=HTTP2_AVAILABLE,
+                retries=3,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=40)
+            )
+        self.client = httpx.Client(transport=transport, **self._client_options())
+    
+    def _get(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None
+    ):
+        """
+        Send a GET request, retrying rate-limited and transient server errors.
+        
+        Args:
+            path: API path relative to the Jira URL
+            params: Optional query parameters
+            headers: Optional extra request headers
             
-            elif block_type == "bulletList":
-                for item in block.get("content", []):
-                    item_text = self._extract_text(item)
-                    text_parts.append(f"• {item_text}")
+        Returns:
+            The httpx response
+        """
+        for attempt in range(MAX_RETRIES + 1):
+            request = self.client.build_request("GET", path, params=params, headers=headers)
+            response = self.client.send(request, stream=True)
+            if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                break
+            response.close()
+            time.sleep(_retry_delay(response, attempt))
+        
+        # Only successful bodies are downloaded; errors are raised from the
+        # status line without reading the body
+        if response.is_success:
+            logger.debug("GET %s: Content-Encoding=%s", path, response.headers.get("Content-Encoding", "identity"))
+            response.read()
+        else:
+            response.close()
+        return response
+    
+    def close(self) -> None:
+        """Close the underlying HTTP client."""
+        self.client.close()
+    
+    def __enter__(self) -> "JiraClient":
+        """Use the client as a context manager that closes the connection on exit."""
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        """Close the client when leaving the with block."""
+        self.close()
+    
+    def get_ticket(self, ticket_id: str, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """
+        Fetch a Jira ticket by ID.
+        
+        Args:
+            ticket_id: The ticket ID (e.g., PROJ-123)
+            fields: Fields to return (default: ticket_fields; ["*all"] for every field)
             
-            elif block_type == "orderedList":
-                for i, item in enumerate(block.get("content", []), 1):
-                    item_text = self._extract_text(item)
-                    text_parts.append(f"{i}. {item_text}")
+        Returns:
+            Dictionary containing ticket data
+        """
+        params = self._ticket_params(fields)
+        key = (ticket_id, params["fields"])
+        entry = self._etag_entry(key)
+        headers = {"If-None-Match": entry[0]} if entry else None
+        
+        response = self._get(f"/rest/api/3/issue/{ticket_id}", params=params, headers=headers)
+        return self._read_ticket(response, ticket_id, key, entry)
+    
+    def get_tickets(self, ticket_ids: List[str], max_workers: int = 8) -> List[Dict[str, Any]]:
+        """
+        Fetch several tickets concurrently.
+        
+        Requests run on a thread pool over the shared client, so their network
+        waits overlap; max_workers should not exceed the pool's connection limit.
+        
+        Args:
+            ticket_ids: The ticket IDs to fetch
+            max_workers: Maximum number of concurrent requests
             
-            elif block_type == "heading":
-                heading_text = self._extract_text(block)
-                level = block.get("attrs", {}).get("level", 1)
-                text_parts.append(f"{'#' * level} {heading_text}")
+        Returns:
+            Ticket data in the same order as ticket_ids
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.get_ticket, ticket_ids))
+    
+    def get_ticket_description(self, ticket_id: str) -> str:
+        """
+        Get the description/requirement from a Jira ticket.
+        
+        Args:
+            ticket_id: The ticket ID (e.g., PROJ-123)
             
-            elif block_type == "codeBlock":
-                code_text = self._extract_text(block)
-                text_parts.append(f"```\n{code_text}\n```")
+        Returns:
+            The ticket description as a string
+        """
+        return self._build_description(self.get_ticket(ticket_id))
+    
+    def _search_page(self, jql: str, start_at: int, max_results: int, **options) -> Dict[str, Any]:
+        """Fetch one page of JQL search results (options as for _search_params)."""
+        response = self._get("/rest/api/3/search", params=self._search_params(jql, max_results, start_at, **options))
         
-        return "\n".join(text_parts)
+        response.raise_for_status()
+        return _json(response)
     
-    def _extract_text(self, block: Dict[str, Any]) -> str:
-        """Extract text content from an ADF block."""
-        content = block.get("content", [])
-        text_parts = []
+    def iter_search(
+        self,
+        jql: str,
+        page_size: int = SEARCH_PAGE_SIZE,
+        max_results: Optional[int] = None,
+        fields: Sequence[str] = SEARCH_FIELDS,
+        validate: bool = True
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yield the tickets matching a JQL query, one page at a time.
         
-        for item in content:
-            if item.get("type") == "text":
-                text_parts.append(item.get("text", ""))
-            elif "content" in item:
-                text_parts.append(self._extract_text(item))
+        Pages are only requested as the caller consumes results, so stopping
+        early skips the remaining pages.
         
-        return "".join(text_parts)
+        Args:
+            jql: JQL query string
+            page_size: Number of results requested per page
+            max_results: Stop after this many results (default: all)
+            fields: Fields returned for each ticket
+            validate: Reject queries naming unknown issue keys (else they are skipped)
+            
+        Yields:
+            Ticket dictionaries
+        """
+        start_at = 0
+        while max_results is None or start_at < max_results:
+            limit = page_size if max_results is None else min(page_size, max_results - start_at)
+            page = self._search_page(jql, start_at, limit, fields=fields, validate=validate)
+            issues = page.get("issues", [])
+            yield from issues
+            
+            start_at += len(issues)
+            if not issues or start_at >= page.get("total", start_at):
+                return
     
-    def search_tickets(self, jql: str, max_results: int = 50) -> list:
+    def search_tickets(
+        self,
+        jql: str,
+        max_results: int = 50,
+        fields: Sequence[str] = SEARCH_FIELDS,
+        validate: bool = True
+    ) -> list:
         """
         Search for tickets using JQL.
         
         Args:
             jql: JQL query string
             max_results: Maximum number of results
+            fields: Fields returned for each ticket
+            validate: Reject queries naming unknown issue keys (else they are skipped)
             
         Returns:
             List of ticket dictionaries
         """
-        url = f"{self.url}/rest/api/3/search"
+        return list(self.iter_search(jql, max_results=max_results, fields=fields, validate=validate))
+    
+    def get_tickets_bulk(self, ticket_ids: List[str], max_workers: int = 4) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch many tickets with "issueKey in (...)" searches instead of one request each.
         
-        params = {
-            "jql": jql,
-            "maxResults": max_results,
-            "fields": "summary,description,status,issuetype"
-        }
+        IDs are searched in chunks of BULK_CHUNK_SIZE, with the chunks run
+        concurrently on a thread pool. Unknown IDs are left out of the result.
         
-        response = self.requests.get(
-            url,
-            headers=self._get_headers(),
-            auth=self._get_auth(),
-            params=params
-        )
+        Args:
+            ticket_ids: The ticket IDs to fetch
+            max_workers: Maximum number of concurrent searches
+            
+        Returns:
+            Dictionary mapping ticket key to ticket data
+        """
+        def search(query: Tuple[str, int]) -> list:
+            jql, count = query
+            return self.search_tickets(jql, max_results=count, fields=self.ticket_fields, validate=False)
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return {
+                issue["key"]: issue
+                for issues in executor.map(search, self._bulk_queries(ticket_ids))
+                for issue in issues
+            }
+    
+    def get_ticket_descriptions(self, ticket_ids: List[str]) -> Dict[str, str]:
+        """
+        Get the descriptions/requirements of several Jira tickets.
+        
+        Args:
+            ticket_ids: The ticket IDs (e.g., ["PROJ-123", "PROJ-124"])
+            
+        Returns:
+            Dictionary mapping ticket key to its description
+        """
+        return {key: self._build_description(ticket) for key, ticket in self.get_tickets_bulk(ticket_ids).items()}
+
+
+class AsyncJiraClient(BaseJiraClient):
+    """
+    Async client for the Jira API.
+    
+    Lets many ticket fetches overlap on one shared (HTTP/2) connection pool
+    instead of waiting on each round-trip in turn.
+    """
+    
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        email: Optional[str] = None,
+        api_token: Optional[str] = None,
+        transport: Optional[Any] = None,
+        max_connections: int = 50
+    ):
+        """
+        Initialize the async Jira client.
+        
+        Args:
+            url: Jira instance URL (e.g., https://company.atlassian.net)
+            email: User email for authentication
+            api_token: API token for authentication
+            transport: Optional httpx async transport (e.g. httpx.MockTransport in tests)
+            max_connections: Maximum concurrent connections to Jira
+        """
+        super().__init__(url, email, api_token)
+        
+        if transport is None:
+            transport = httpx.AsyncHTTPTransport(
+                http2=HTTP2_AVAILABLE,
+                retries=3,
+                limits=httpx.Limits(max_connections=max_connections)
+            )
+        self.client = httpx.AsyncClient(transport=transport, **self._client_options())
+    
+    async def _get(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None
+    ):
+        """Send a GET request, retrying rate-limited and transient server errors."""
+        for attempt in range(MAX_RETRIES + 1):
+            request = self.client.build_request("GET", path, params=params, headers=headers)
+            response = await self.client.send(request, stream=True)
+            if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                break
+            await response.aclose()
+            await asyncio.sleep(_retry_delay(response, attempt))
+        
+        if response.is_success:
+            logger.debug("GET %s: Content-Encoding=%s", path, response.headers.get("Content-Encoding", "identity"))
+            await response.aread()
+        else:
+            await response.aclose()
+        return response
+    
+    async def aclose(self) -> None:
+        """Close the underlying HTTP client."""
+        await self.client.aclose()
+    
+    async def __aenter__(self) -> "AsyncJiraClient":
+        """Use the client as an async context manager that closes the connection on exit."""
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        """Close the client when leaving the async with block."""
+        await self.aclose()
+    
+    async def get_ticket(self, ticket_id: str, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """
+        Fetch a Jira ticket by ID.
+        
+        Args:
+            ticket_id: The ticket ID (e.g., PROJ-123)
+            fields: Fields to return (default: ticket_fields; ["*all"] for every field)
+            
+        Returns:
+            Dictionary containing ticket data
+        """
+        params = self._ticket_params(fields)
+        key = (ticket_id, params["fields"])
+        entry = self._etag_entry(key)
+        headers = {"If-None-Match": entry[0]} if entry else None
+        
+        response = await self._get(f"/rest/api/3/issue/{ticket_id}", params=params, headers=headers)
+        return self._read_ticket(response, ticket_id, key, entry)
+    
+    async def get_tickets(self, ticket_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Fetch several tickets concurrently.
+        
+        Args:
+            ticket_ids: The ticket IDs to fetch
+            
+        Returns:
+            Ticket data in the same order as ticket_ids
+        """
+        return list(await asyncio.gather(*(self.get_ticket(t) for t in ticket_ids)))
+    
+    async def get_ticket_description(self, ticket_id: str) -> str:
+        """
+        Get the description/requirement from a Jira ticket.
+        
+        Args:
+            ticket_id: The ticket ID (e.g., PROJ-123)
+            
+        Returns:
+            The ticket description as a string
+        """
+        return self._build_description(await self.get_ticket(ticket_id))
+    
+    async def _search_page(self, jql: str, start_at: int, max_results: int, **options) -> Dict[str, Any]:
+        """Fetch one page of JQL search results (options as for _search_params)."""
+        response = await self._get("/rest/api/3/search", params=self._search_params(jql, max_results, start_at, **options))
         
         response.raise_for_status()
-        return response.json().get("issues", [])
+        return _json(response)
+    
+    async def search_tickets(
+        self,
+        jql: str,
+        max_results: int = 50,
+        fetch_full: bool = False,
+        fields: Sequence[str] = SEARCH_FIELDS,
+        validate: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Search for tickets using JQL.
+        
+        The first page reports the total match count; any remaining pages
+        are then fetched concurrently.
+        
+        Args:
+            jql: JQL query string
+            max_results: Maximum number of results
+            fetch_full: Fetch every matching ticket in full, concurrently
+            fields: Fields returned for each ticket
+            validate: Reject queries naming unknown issue keys (else they are skipped)
+            
+        Returns:
+            List of ticket dictionaries
+        """
+        options = {"fields": fields, "validate": validate}
+        first = await self._search_page(jql, 0, min(SEARCH_PAGE_SIZE, max_results), **options)
+        issues = first.get("issues", [])
+        
+        # Jira may return fewer results per page than requested
+        step = len(issues)
+        total = min(first.get("total", step), max_results)
+        if step:
+            pages = await asyncio.gather(*(
+                self._search_page(jql, start_at, min(step, total - start_at), **options)
+                for start_at in range(step, total, step)
+            ))
+            for page in pages:
+                issues.extend(page.get("issues", []))
+        
+        if fetch_full:
+            return await self.get_tickets([issue["key"] for issue in issues])
+        return issues
+    
+    async def get_tickets_bulk(self, ticket_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch many tickets with concurrent "issueKey in (...)" searches.
+        
+        Args:
+            ticket_ids: The ticket IDs to fetch
+            
+        Returns:
+            Dictionary mapping ticket key to ticket data (unknown IDs are left out)
+        """
+        results = await asyncio.gather(*(
+            self.search_tickets(jql, max_results=count, fields=self.ticket_fields, validate=False)
+            for jql, count in self._bulk_queries(ticket_ids)
+        ))
+        return {issue["key"]: issue for issues in results for issue in issues}
+    
+    async def get_ticket_descriptions(self, ticket_ids: List[str]) -> Dict[str, str]:
+        """
+        Get the descriptions/requirements of several Jira tickets.
+        
+        Args:
+            ticket_ids: The ticket IDs (e.g., ["PROJ-123", "PROJ-124"])
+            
+        Returns:
+            Dictionary mapping ticket key to its description
+        """
+        tickets = await self.get_tickets_bulk(ticket_ids)
+        return {key: self._build_description(ticket) for key, ticket in tickets.items()}
 
 
 def main():
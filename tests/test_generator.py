@@ -2,9 +2,12 @@
 Tests for the AI Test Case Generator
 """
 
+import importlib.util
+
 import pytest
 from src.edge_cases import EdgeCaseAnalyzer
 from src.formatters import TestCaseFormatter
+from src.cache import DiskCache, SemanticCache
 
 
 class TestEdgeCaseAnalyzer:
@@ -26,6 +29,13 @@ class TestEdgeCaseAnalyzer:
         
         assert "Invalid email format" in result
     
+    def test_analyze_is_case_insensitive(self):
+        """Test patterns match regardless of letter case."""
+        requirement = "User enters their EMAIL address"
+        result = self.analyzer.analyze(requirement)
+        
+        assert "Invalid email format" in result
+    
     def test_analyze_detects_password_patterns(self):
         """Test password-related edge cases are detected."""
         requirement = "User enters password to login"
@@ -49,6 +59,14 @@ class TestEdgeCaseAnalyzer:
         assert "Concurrent user actions" in result
         assert "Browser back button" in result
     
+    def test_analyze_short_requirement_returns_universal_cases(self):
+        """Test requirements too short for any keyword skip pattern matching."""
+        EdgeCaseAnalyzer.clear_cache()
+        result = self.analyzer.analyze("ok")
+        
+        assert result == sorted(EdgeCaseAnalyzer.UNIVERSAL_EDGE_CASES)
+        assert len(EdgeCaseAnalyzer._cache) == 0
+    
     def test_analyze_with_categories(self):
         """Test categorized analysis."""
         requirement = "User enters email and password"
@@ -56,6 +74,35 @@ class TestEdgeCaseAnalyzer:
         
         assert isinstance(result, dict)
         assert "Universal" in result
+    
+    def test_analyze_with_categories_detects_multiple_categories(self):
+        """Test every matching category is reported from a single scan."""
+        requirement = "User enters email and password"
+        result = self.analyzer.analyze_with_categories(requirement)
+        
+        assert list(result) == ["Input", "Email", "Password", "Universal"]
+    
+    def test_analyze_repeated_calls_use_cache(self):
+        """Test repeated analysis is served from the cache."""
+        EdgeCaseAnalyzer.clear_cache()
+        requirement = "User uploads a file"
+        
+        first = self.analyzer.analyze(requirement)
+        first.append("mutated")
+        second = EdgeCaseAnalyzer().analyze(requirement)
+        
+        assert "mutated" not in second
+        assert len(EdgeCaseAnalyzer._cache) == 1
+    
+    def test_analyze_long_requirement_cached_by_digest(self):
+        """Test long requirements are not stored verbatim in the cache."""
+        EdgeCaseAnalyzer.clear_cache()
+        requirement = "search " * EdgeCaseAnalyzer.HASH_THRESHOLD
+        
+        result = self.analyzer.analyze(requirement)
+        
+        assert "No results found" in result
+        assert all(isinstance(key, bytes) for key in EdgeCaseAnalyzer._cache)
 
 
 class TestFormatter:
@@ -138,6 +185,39 @@ class TestFormatter:
         assert parsed["feature"] == "Login"
         assert len(parsed["test_cases"]) == 1
     
+    def test_format_json_matches_stdlib_fallback(self, monkeypatch):
+        """Test orjson and stdlib JSON output are interchangeable."""
+        from src import formatters
+        
+        cases = [{"name": "Ünïcode ✓", "given": ["a"], "then": []}]
+        with_orjson = self.formatter.format(cases, output_format="json")
+        monkeypatch.setattr(formatters, "ORJSON_AVAILABLE", False)
+        without_orjson = self.formatter.format(cases, output_format="json")
+        
+        assert with_orjson == without_orjson
+    
+    def test_format_streams_to_file(self, tmp_path):
+        """Test writing to a stream produces the same output as the string."""
+        expected = self.formatter.format(self.sample_test_cases, output_format="plain")
+        output_file = tmp_path / "tests.txt"
+        
+        with output_file.open("w", encoding="utf-8") as f:
+            result = self.formatter.format(self.sample_test_cases, output_format="plain", out=f)
+        
+        assert result is None
+        assert output_file.read_text(encoding="utf-8") == expected
+    
+    def test_format_json_streams_to_file(self, tmp_path):
+        """Test JSON streamed to a file matches the string output."""
+        cases = [{"name": "Ünïcode ✓", "given": ["a"], "then": []}]
+        expected = self.formatter.format(cases, output_format="json")
+        output_file = tmp_path / "tests.json"
+        
+        with output_file.open("w", encoding="utf-8") as f:
+            self.formatter.format(cases, output_format="json", out=f)
+        
+        assert output_file.read_text(encoding="utf-8") == expected
+    
     def test_invalid_format_raises_error(self):
         """Test that invalid format raises ValueError."""
         with pytest.raises(ValueError):
@@ -171,10 +251,826 @@ class TestSnakeCaseConversion:
         assert self.formatter._to_camel_case("Test Case") == "testCase"
 
 
+class TestDiskCache:
+    """Tests for DiskCache."""
+    
+    def test_get_missing_key_returns_none(self, tmp_path):
+        """Test a cache miss returns None."""
+        cache = DiskCache(tmp_path / "cache.json")
+        assert cache.get("missing") is None
+    
+    def test_set_persists_across_instances(self, tmp_path):
+        """Test stored responses survive a new cache instance."""
+        path = tmp_path / "nested" / "cache.json"
+        DiskCache(path).set("key", "response")
+        
+        assert DiskCache(path).get("key") == "response"
+    
+    def test_oldest_entries_evicted(self, tmp_path):
+        """Test the cache keeps at most max_entries, dropping the oldest."""
+        path = tmp_path / "cache.json"
+        cache = DiskCache(path, max_entries=2)
+        for key in ("a", "b", "c"):
+            cache.set(key, key.upper())
+        
+        reloaded = DiskCache(path)
+        assert [reloaded.get(key) for key in ("a", "b", "c")] == [None, "B", "C"]
+    
+    def test_entries_from_other_writers_kept(self, tmp_path):
+        """Test a write merges entries another instance wrote meanwhile."""
+        path = tmp_path / "cache.json"
+        first, second = DiskCache(path), DiskCache(path)
+        first.set("a", "A")
+        second.set("b", "B")
+        
+        assert DiskCache(path).get("a") == "A"
+    
+    def test_corrupt_file_treated_as_empty(self, tmp_path):
+        """Test an unreadable cache file does not raise."""
+        path = tmp_path / "cache.json"
+        path.write_text("{not json")
+        
+        cache = DiskCache(path)
+        assert cache.get("key") is None
+        cache.set("key", "response")
+        assert DiskCache(path).get("key") == "response"
+
+
+class TestSemanticCache:
+    """Tests for SemanticCache."""
+    
+    VECTORS = {
+        "login with email": [1.0, 0.0, 0.0],
+        "user signs in via email": [0.98, 0.1, 0.0],
+        "upload a file": [0.0, 1.0, 0.0],
+    }
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        pytest.importorskip("numpy")
+        self.bucket = SemanticCache.bucket("model", "gherkin", 10)
+    
+    def make_cache(self, path=None):
+        """Create a cache backed by the fixed test vectors."""
+        return SemanticCache(embed=self.VECTORS.__getitem__, path=path)
+    
+    def test_similar_requirement_hits(self):
+        """Test a reworded requirement reuses the stored response."""
+        cache = self.make_cache()
+        cache.add(cache.embed("login with email"), self.bucket, "login tests")
+        
+        result = cache.get(cache.embed("user signs in via email"), self.bucket)
+        
+        assert result == "login tests"
+        assert cache.stats == {"hits": 1, "misses": 0}
+    
+    def test_dissimilar_requirement_misses(self):
+        """Test an unrelated requirement is not served from the cache."""
+        cache = self.make_cache()
+        cache.add(cache.embed("login with email"), self.bucket, "login tests")
+        
+        assert cache.get(cache.embed("upload a file"), self.bucket) is None
+        assert cache.stats == {"hits": 0, "misses": 1}
+    
+    def test_buckets_are_isolated(self):
+        """Test responses never leak across generation settings."""
+        cache = self.make_cache()
+        cache.add(cache.embed("login with email"), self.bucket, "login tests")
+        other = SemanticCache.bucket("model", "pytest", 10)
+        
+        assert cache.get(cache.embed("login with email"), other) is None
+    
+    def test_storage_grows_past_initial_capacity(self):
+        """Test every entry stays searchable as the embedding array grows."""
+        import numpy as np
+        
+        cache = SemanticCache(embed=lambda text: np.eye(20)[int(text)])
+        for i in range(20):
+            cache.add(cache.embed(str(i)), self.bucket, f"response {i}")
+        
+        assert all(
+            cache.get(cache.embed(str(i)), self.bucket) == f"response {i}" for i in range(20)
+        )
+    
+    def test_entries_persist_to_disk(self, tmp_path):
+        """Test entries are reloaded from the .npz and .json files."""
+        path = tmp_path / "semantic.npz"
+        with self.make_cache(path) as cache:
+            cache.add(cache.embed("login with email"), self.bucket, "login tests")
+        
+        reloaded = self.make_cache(path)
+        assert reloaded.get(reloaded.embed("login with email"), self.bucket) == "login tests"
+    
+    def test_saves_are_batched(self, tmp_path):
+        """Test entries are written every save_every inserts, responses as JSON."""
+        import json
+        
+        path = tmp_path / "semantic.npz"
+        cache = SemanticCache(embed=self.VECTORS.__getitem__, path=path, save_every=2)
+        cache.add(cache.embed("login with email"), self.bucket, "login tests")
+        assert not path.exists()
+        
+        cache.add(cache.embed("upload a file"), self.bucket, "upload tests")
+        assert path.exists()
+        assert json.loads(path.with_suffix(".json").read_text()) == {self.bucket: ["login tests", "upload tests"]}
+
+
+class TestBatchPrompt:
+    """Tests for batched prompt building and response splitting."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        from src.generator import TestCaseGenerator
+        
+        # Bypass __init__ so no LLM client is created
+        self.generator = TestCaseGenerator.__new__(TestCaseGenerator)
+    
+    def test_batch_prompt_marks_each_requirement(self):
+        """Test every requirement gets its own marker."""
+        prompt = self.generator._build_batch_prompt(
+            ["User logs in", "User uploads a file"], "gherkin", 5, [[], ["Empty file"]]
+        )
+        
+        assert "===REQ_1===\n## Requirement:\nUser logs in" in prompt
+        assert "===REQ_2===\n## Requirement:\nUser uploads a file" in prompt
+        assert "- Empty file" in prompt
+    
+    def test_split_batch_response(self):
+        """Test the response is split back into per-requirement sections."""
+        response = "Sure!\n===REQ_1===\nFeature: Login\n\n===REQ_2===\nFeature: Upload\n"
+        
+        sections = self.generator._split_batch_response(response, 3)
+        
+        assert sections == ["Feature: Login", "Feature: Upload", ""]
+
+
+class TestBatchGeneration:
+    """Tests for grouping batched requirements and recovering skipped sections."""
+    
+    def setup_method(self):
+        """Set up a generator whose model is a stub."""
+        from src.edge_cases import EdgeCaseAnalyzer
+        from src.generator import TestCaseGenerator
+        
+        self.generator = TestCaseGenerator.__new__(TestCaseGenerator)
+        self.generator.edge_analyzer = EdgeCaseAnalyzer()
+        self.generator.cache = None
+        self.generator.semantic_cache = None
+        self.generator.max_input_tokens = 100000
+        self.generator.max_workers = 2
+        self.prompts = []
+    
+    def test_batches_are_bounded_and_skipped_sections_regenerated(self):
+        """Test requirements are split into groups and missing sections are generated alone."""
+        def call_model(prompt):
+            self.prompts.append(prompt)
+            if "===REQ_" not in prompt:
+                return "Feature: retried"
+            # The output is truncated after the (Markdown-wrapped) first section
+            return "**===REQ_1===**\nFeature: 1\n"
+        
+        self.generator._call_model = call_model
+        
+        results = self.generator.generate_batch(
+            ["Req one", "Req two", "Req three", "Req four"], include_edge_cases=False, batch_size=3
+        )
+        
+        batched = [p for p in self.prompts if "===REQ_" in p]
+        assert len(batched) == 1
+        assert "Req four" not in batched[0]
+        assert results == ["Feature: 1", "Feature: retried", "Feature: retried", "Feature: retried"]
+    
+    def test_groups_respect_max_input_tokens(self):
+        """Test a group is closed before its prompt would exceed max_input_tokens."""
+        self.generator.max_input_tokens = 400
+        requirements = ["x" * 600, "y" * 600, "z" * 600]
+        
+        groups = self.generator._batch_groups(requirements, "gherkin", 5, [[], [], []], 5)
+        
+        assert groups == [[0], [1], [2]]
+
+
+class TestChunkedGeneration:
+    """Tests for splitting oversized requirements and merging their results."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        from src.generator import TestCaseGenerator
+        
+        self.generator = TestCaseGenerator.__new__(TestCaseGenerator)
+    
+    def test_split_requirement_respects_budget(self):
+        """Test chunks stay within budget and keep paragraphs whole."""
+        requirement = "\n\n".join(["a" * 40, "b" * 40, "c" * 40, "d" * 150])
+        
+        chunks = self.generator._split_requirement(requirement, 100)
+        
+        assert chunks[0] == "a" * 40 + "\n\n" + "b" * 40
+        assert all(len(chunk) <= 100 for chunk in chunks)
+        assert "".join(chunks).replace("\n", "") == requirement.replace("\n", "")
+    
+    def test_merge_responses_drops_duplicate_scenarios(self):
+        """Test scenarios repeated across chunks appear once."""
+        responses = [
+            "Feature: Login\n\n  Scenario: Valid login\n    Given a user\n",
+            "Feature: Login\n\n  Scenario: valid login\n    Given a user\n"
+            "\n  Scenario: Locked account\n    Given a locked user\n",
+        ]
+        
+        merged = self.generator._merge_responses(responses, "gherkin")
+        
+        assert merged.count("Feature: Login") == 1
+        assert merged.lower().count("scenario: valid login") == 1
+        assert "Scenario: Locked account" in merged
+    
+    def test_merge_responses_keeps_decorators_and_preambles(self):
+        """Test decorators stay with their test and every chunk's imports/fixtures are kept."""
+        import ast
+        
+        responses = [
+            "import pytest\nfrom app import login\n\n\n"
+            "@pytest.fixture\ndef user():\n    return login.User()\n\n\n"
+            "@pytest.mark.skip\ndef test_valid_login(user):\n    assert user\n",
+            "import pytest\nfrom app import upload\n\n\n"
+            "@pytest.mark.parametrize('x', [\n    1,\n    2,\n])\n"
+            "def test_valid_login(x):\n    assert x\n\n\n"
+            "# Uploads\ndef test_other():\n    assert upload\n",
+        ]
+        
+        merged = self.generator._merge_responses(responses, "pytest")
+        
+        ast.parse(merged)
+        assert "from app import login\nfrom app import upload" in merged
+        assert "def user():" in merged
+        assert "@pytest.mark.skip\ndef test_valid_login(user):" in merged
+        assert "parametrize" not in merged
+        assert "# Uploads\ndef test_other():" in merged
+    
+    def test_merge_responses_moves_gherkin_tags_with_scenarios(self):
+        """Test tags of a dropped duplicate scenario do not land on the next one."""
+        responses = [
+            "Feature: Login\n\n  @smoke\n  Scenario: Valid login\n    Given a user\n",
+            "Feature: Login\n\n  @wip\n  Scenario: Valid login\n    Given a user\n"
+            "  @security\n  Scenario: Locked account\n    Given a locked user\n",
+        ]
+        
+        merged = self.generator._merge_responses(responses, "gherkin")
+        
+        assert "@wip" not in merged
+        assert "  @smoke\n  Scenario: Valid login" in merged
+        assert "    Given a user\n\n  @security\n  Scenario: Locked account" in merged
+    
+    def test_merge_responses_combines_json_test_cases(self):
+        """Test JSON chunk responses merge into one valid document."""
+        import json
+        
+        responses = [
+            '```json\n{"test_cases": [{"name": "Valid login"}]}\n```',
+            '{"test_cases": [{"name": "valid login"}, {"name": "Locked account"}]}',
+        ]
+        
+        merged = json.loads(self.generator._merge_responses(responses, "json"))
+        
+        assert merged == {"test_cases": [{"name": "Valid login"}, {"name": "Locked account"}]}
+    
+    def test_merge_responses_strips_code_fences(self):
+        """Test fenced Gherkin responses merge without stray fences."""
+        responses = [
+            "```gherkin\nFeature: Login\n\n  Scenario: A\n    Given a user\n```",
+            "```gherkin\nFeature: Login\n\n  Scenario: B\n    Given a user\n```\n",
+        ]
+        
+        merged = self.generator._merge_responses(responses, "gherkin")
+        
+        assert "```" not in merged
+        assert merged.count("Feature: Login") == 1
+        assert "Scenario: A" in merged and "Scenario: B" in merged
+
+
+class TestJiraClient:
+    """Tests for JiraClient against a mocked Jira API."""
+    
+    def make_client(self, handler):
+        """Create a client whose requests are answered by handler."""
+        httpx = pytest.importorskip("httpx")
+        from src.jira_client import JiraClient
+        
+        return JiraClient(
+            url="https://example.atlassian.net",
+            email="qa@example.com",
+            api_token="token",
+            transport=httpx.MockTransport(handler)
+        )
+    
+    def test_get_ticket_description(self):
+        """Test summary and description are combined into a requirement."""
+        import httpx
+        
+        def handler(request):
+            assert request.url.path == "/rest/api/3/issue/PROJ-1"
+            return httpx.Response(200, json={"fields": {"summary": "Login", "description": "Email login"}})
+        
+        with self.make_client(handler) as client:
+            description = client.get_ticket_description("PROJ-1")
+        
+        assert description == "Title: Login\n\nDescription:\nEmail login"
+    
+    def test_acceptance_criteria_from_configured_fields(self, monkeypatch):
+        """Test only the configured acceptance fields are requested and read."""
+        import httpx
+        monkeypatch.setenv("JIRA_ACCEPTANCE_FIELDS", "customfield_1")
+        
+        def handler(request):
+            assert request.url.params["fields"] == "summary,description,updated,customfield_1"
+            return httpx.Response(200, json={"fields": {"customfield_1": "Must log in", "customfield_2": "Ignored"}})
+        
+        with self.make_client(handler) as client:
+            description = client.get_ticket_description("PROJ-1")
+        
+        assert description == "\nAcceptance Criteria:\nMust log in"
+    
+    def test_acceptance_fields_off_by_default_and_text_only(self, monkeypatch):
+        """Test no custom fields are read by default and non-text values are skipped."""
+        import httpx
+        monkeypatch.delenv("JIRA_ACCEPTANCE_FIELDS", raising=False)
+        
+        with self.make_client(lambda request: httpx.Response(200, json={})) as client:
+            assert client.ticket_fields == ("summary", "description", "updated")
+            client.acceptance_fields = ("customfield_1", "customfield_2", "customfield_3")
+            ticket = {"fields": {
+                "customfield_1": 5.0,
+                "customfield_2": [{"name": "Sprint 1"}],
+                "customfield_3": {"type": "doc", "content": [
+                    {"type": "paragraph", "content": [{"type": "text", "text": "Must log in"}]}
+                ]}
+            }}
+            assert client._build_description(ticket) == "\nAcceptance Criteria:\nMust log in"
+    
+    def test_compressed_responses_accepted(self):
+        """Test requests advertise compression and gzip bodies are decoded."""
+        import gzip
+        import json
+        import httpx
+        from src.jira_client import ACCEPT_ENCODING
+        
+        def handler(request):
+            assert request.headers["Accept-Encoding"] == ACCEPT_ENCODING
+            body = gzip.compress(json.dumps({"fields": {"summary": "Login"}}).encode())
+            return httpx.Response(200, content=body, headers={"Content-Encoding": "gzip"})
+        
+        with self.make_client(handler) as client:
+            assert client.get_ticket("PROJ-1") == {"fields": {"summary": "Login"}}
+    
+    def test_redirects_are_followed(self):
+        """Test a redirected ticket request is followed to its new location."""
+        import httpx
+        
+        def handler(request):
+            if request.url.path == "/rest/api/3/issue/OLD-1":
+                return httpx.Response(301, headers={"Location": "/rest/api/3/issue/NEW-1"})
+            return httpx.Response(200, json={"key": "NEW-1", "fields": {}})
+        
+        with self.make_client(handler) as client:
+            assert client.get_ticket("OLD-1")["key"] == "NEW-1"
+    
+    def test_missing_ticket_raises_value_error(self):
+        """Test a 404 is reported as a missing ticket."""
+        import httpx
+        
+        with self.make_client(lambda request: httpx.Response(404)) as client:
+            with pytest.raises(ValueError, match="Ticket not found"):
+                client.get_ticket("PROJ-404")
+    
+    def test_error_body_is_not_downloaded(self):
+        """Test a failed request is raised without reading its body."""
+        import httpx
+        
+        class Body(httpx.SyncByteStream):
+            read = False
+            
+            def __iter__(self):
+                Body.read = True
+                yield b"{}"
+        
+        with self.make_client(lambda request: httpx.Response(403, stream=Body())) as client:
+            with pytest.raises(httpx.HTTPStatusError):
+                client.get_ticket("PROJ-1")
+        
+        assert not Body.read
+    
+    def test_get_ticket_requests_only_needed_fields(self):
+        """Test ticket fetches are restricted to the requested fields."""
+        import httpx
+        seen = []
+        
+        def handler(request):
+            seen.append(request.url.params["fields"])
+            return httpx.Response(200, json={"fields": {}})
+        
+        with self.make_client(handler) as client:
+            client.get_ticket("PROJ-1")
+            client.get_ticket("PROJ-1", fields=["summary", "status"])
+        
+        assert seen[0].startswith("summary,description,updated")
+        assert seen[1] == "summary,status"
+    
+    def test_unchanged_ticket_served_from_etag_cache(self):
+        """Test a 304 Not Modified reuses the previously fetched ticket."""
+        import httpx
+        
+        def handler(request):
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, json={"fields": {"summary": "Login"}}, headers={"ETag": '"v1"'})
+        
+        with self.make_client(handler) as client:
+            first = client.get_ticket("PROJ-1")
+            second = client.get_ticket("PROJ-1")
+        
+        assert first == second == {"fields": {"summary": "Login"}}
+    
+    def test_etag_cached_ticket_not_shared(self):
+        """Test modifying a returned ticket does not change later 304 results."""
+        import httpx
+        
+        def handler(request):
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, json={"fields": {"summary": "Login"}}, headers={"ETag": '"v1"'})
+        
+        with self.make_client(handler) as client:
+            client.get_ticket("PROJ-1")["fields"]["summary"] = "Changed"
+            client.get_ticket("PROJ-1")["fields"]["summary"] = "Changed again"
+            
+            assert client.get_ticket("PROJ-1") == {"fields": {"summary": "Login"}}
+    
+    def test_search_tickets_fields_and_expand(self):
+        """Test searches list the returned fields and skip expansions."""
+        import httpx
+        
+        def handler(request):
+            assert request.url.params.get_list("fields") == ["summary", "description", "status", "issuetype"]
+            assert request.url.params["expand"] == ""
+            return httpx.Response(200, json={"issues": [{"key": "PROJ-1"}]})
+        
+        with self.make_client(handler) as client:
+            assert client.search_tickets("project = PROJ") == [{"key": "PROJ-1"}]
+    
+    def test_iter_search_pages_lazily(self):
+        """Test search pages are only fetched as results are consumed."""
+        import httpx
+        from itertools import islice
+        starts = []
+        
+        def handler(request):
+            start = int(request.url.params["startAt"])
+            starts.append(start)
+            count = min(2, int(request.url.params["maxResults"]))
+            issues = [{"key": f"PROJ-{i}"} for i in range(start, start + count)]
+            return httpx.Response(200, json={"startAt": start, "total": 10, "issues": issues})
+        
+        with self.make_client(handler) as client:
+            keys = [issue["key"] for issue in islice(client.iter_search("project = PROJ", page_size=2), 3)]
+            assert len(client.search_tickets("project = PROJ", max_results=5)) == 5
+        
+        assert keys == ["PROJ-0", "PROJ-1", "PROJ-2"]
+        assert starts == [0, 2, 0, 2, 4]
+    
+    def test_get_ticket_descriptions_in_bulk(self, monkeypatch):
+        """Test descriptions are fetched with chunked issueKey searches."""
+        import httpx
+        monkeypatch.setattr("src.jira_client.BULK_CHUNK_SIZE", 2)
+        queries = []
+        
+        def handler(request):
+            assert request.url.path == "/rest/api/3/search"
+            assert request.url.params["validateQuery"] == "warn"
+            assert "updated" in request.url.params.get_list("fields")
+            jql = request.url.params["jql"]
+            queries.append(jql)
+            keys = jql[len("issueKey in ("):-1].replace('"', "").split(",")
+            issues = [{"key": key, "fields": {"summary": key}} for key in keys if key != "PROJ-404"]
+            return httpx.Response(200, json={"total": len(issues), "issues": issues})
+        
+        with self.make_client(handler) as client:
+            descriptions = client.get_ticket_descriptions(["PROJ-1", "PROJ-2", "PROJ-1", "PROJ-404"])
+        
+        assert sorted(queries) == ['issueKey in ("PROJ-1","PROJ-2")', 'issueKey in ("PROJ-404")']
+        assert descriptions == {"PROJ-1": "Title: PROJ-1", "PROJ-2": "Title: PROJ-2"}
+    
+    def test_bulk_rejects_malformed_keys(self):
+        """Test a key that would change the JQL query is rejected before any request."""
+        with self.make_client(lambda request: pytest.fail("request sent")) as client:
+            with pytest.raises(ValueError, match="Invalid ticket key"):
+                client.get_tickets_bulk(["PROJ-1", "PROJ-2) OR project = SECRET"])
+    
+    def test_stdlib_json_fallback(self, monkeypatch):
+        """Test responses decode without orjson installed."""
+        import httpx
+        monkeypatch.setattr("src.jira_client.ORJSON_AVAILABLE", False)
+        
+        with self.make_client(lambda request: httpx.Response(200, json={"fields": {"summary": "Ünïcode"}})) as client:
+            assert client.get_ticket("PROJ-1") == {"fields": {"summary": "Ünïcode"}}
+    
+    def test_transient_errors_are_retried(self, monkeypatch):
+        """Test 5xx responses are retried before succeeding."""
+        import httpx
+        monkeypatch.setattr("src.jira_client.RETRY_BACKOFF", 0)
+        statuses = iter([503, 502, 200])
+        
+        def handler(request):
+            return httpx.Response(next(statuses), json={"fields": {}})
+        
+        with self.make_client(handler) as client:
+            assert client.get_ticket("PROJ-1") == {"fields": {}}
+    
+    def test_retry_after_is_honoured(self, monkeypatch):
+        """Test a 429 waits for the server's Retry-After instead of the backoff."""
+        import httpx
+        sleeps = []
+        monkeypatch.setattr("src.jira_client.time.sleep", sleeps.append)
+        statuses = iter([(429, {"Retry-After": "2"}), (503, {}), (200, {})])
+        
+        def handler(request):
+            status, headers = next(statuses)
+            return httpx.Response(status, json={"fields": {}}, headers=headers)
+        
+        with self.make_client(handler) as client:
+            assert client.get_ticket("PROJ-1") == {"fields": {}}
+        
+        assert sleeps == [2.0, 0.6]
+    
+    def test_get_tickets_preserves_order(self):
+        """Test tickets fetched on the thread pool come back in request order."""
+        import httpx
+        
+        def handler(request):
+            return httpx.Response(200, json={"key": request.url.path.rsplit("/", 1)[-1]})
+        
+        with self.make_client(handler) as client:
+            tickets = client.get_tickets(["PROJ-1", "PROJ-2", "PROJ-3"], max_workers=3)
+        
+        assert [t["key"] for t in tickets] == ["PROJ-1", "PROJ-2", "PROJ-3"]
+    
+    def test_parse_adf_handles_deep_nesting(self):
+        """Test deeply nested ADF is flattened without hitting the recursion limit."""
+        import sys
+        
+        node = {"type": "text", "text": "deep"}
+        for _ in range(sys.getrecursionlimit() + 100):
+            node = {"type": "listItem", "content": [node]}
+        adf = {"content": [
+            {"type": "heading", "attrs": {"level": 2}, "content": [{"type": "text", "text": "Rules"}]},
+            {"type": "bulletList", "content": [node]}
+        ]}
+        
+        client = self.make_client(lambda request: None)
+        assert client._parse_adf(adf) == "## Rules\n• deep"
+    
+    def test_parse_adf_clamps_heading_levels(self):
+        """Test heading levels outside 1-6 use the nearest Markdown prefix."""
+        def heading(level):
+            return {"type": "heading", "attrs": {"level": level}, "content": [{"type": "text", "text": "H"}]}
+        
+        client = self.make_client(lambda request: None)
+        assert client._parse_adf({"content": [heading(0), heading(3), heading(9)]}) == "# H\n### H\n###### H"
+    
+    def test_adf_cached_until_ticket_updated(self, monkeypatch):
+        """Test ADF is parsed once per ticket version."""
+        import httpx
+        from src.jira_client import BaseJiraClient
+        BaseJiraClient.clear_cache()
+        versions = iter(["2024-01-01", "2024-01-01", "2024-01-02"])
+        
+        def handler(request):
+            adf = {"content": [{"type": "paragraph", "content": [{"type": "text", "text": "Rules"}]}]}
+            return httpx.Response(200, json={"key": "PROJ-1", "fields": {"updated": next(versions), "description": adf}})
+        
+        calls = []
+        parse_adf = BaseJiraClient._parse_adf
+        monkeypatch.setattr(BaseJiraClient, "_parse_adf", lambda self, adf: calls.append(1) or parse_adf(self, adf))
+        
+        with self.make_client(handler) as client:
+            descriptions = [client.get_ticket_description("PROJ-1") for _ in range(3)]
+        
+        assert descriptions == ["\nDescription:\nRules"] * 3
+        assert len(calls) == 2
+    
+    def test_adf_cache_separated_per_jira_site(self):
+        """Test clients for different Jira sites do not share parsed ADF text."""
+        pytest.importorskip("httpx")
+        from src.jira_client import BaseJiraClient
+        BaseJiraClient.clear_cache()
+        
+        def ticket(text):
+            adf = {"content": [{"type": "paragraph", "content": [{"type": "text", "text": text}]}]}
+            return {"key": "PROJ-1", "fields": {"updated": "2024-01-01", "description": adf}}
+        
+        first = BaseJiraClient("https://one.atlassian.net", "qa@example.com", "token")
+        second = BaseJiraClient("https://two.atlassian.net", "qa@example.com", "token")
+        
+        assert first._build_description(ticket("One")) == "\nDescription:\nOne"
+        assert second._build_description(ticket("Two")) == "\nDescription:\nTwo"
+
+
+class TestAsyncJiraClient:
+    """Tests for AsyncJiraClient against a mocked Jira API."""
+    
+    def make_client(self, handler):
+        """Create an async client whose requests are answered by handler."""
+        httpx = pytest.importorskip("httpx")
+        from src.jira_client import AsyncJiraClient
+        
+        return AsyncJiraClient(
+            url="https://example.atlassian.net",
+            email="qa@example.com",
+            api_token="token",
+            transport=httpx.MockTransport(handler)
+        )
+    
+    def test_get_tickets_preserves_order(self):
+        """Test concurrently fetched tickets come back in request order."""
+        import asyncio
+        import httpx
+        
+        def handler(request):
+            key = request.url.path.rsplit("/", 1)[-1]
+            return httpx.Response(200, json={"key": key, "fields": {}})
+        
+        async def run():
+            async with self.make_client(handler) as client:
+                return await client.get_tickets(["PROJ-1", "PROJ-2", "PROJ-3"])
+        
+        tickets = asyncio.run(run())
+        
+        assert [t["key"] for t in tickets] == ["PROJ-1", "PROJ-2", "PROJ-3"]
+    
+    def test_search_fetch_full(self):
+        """Test search results can be expanded into full tickets."""
+        import asyncio
+        import httpx
+        
+        def handler(request):
+            if request.url.path == "/rest/api/3/search":
+                return httpx.Response(200, json={"issues": [{"key": "PROJ-1"}]})
+            return httpx.Response(200, json={"key": "PROJ-1", "fields": {"summary": "Login"}})
+        
+        async def run():
+            async with self.make_client(handler) as client:
+                return await client.search_tickets("project = PROJ", fetch_full=True)
+        
+        assert asyncio.run(run()) == [{"key": "PROJ-1", "fields": {"summary": "Login"}}]
+    
+    def test_search_fetches_remaining_pages(self):
+        """Test pages after the first are requested from the reported total."""
+        import asyncio
+        import httpx
+        
+        def handler(request):
+            start = int(request.url.params["startAt"])
+            count = min(2, int(request.url.params["maxResults"]))
+            issues = [{"key": f"PROJ-{i}"} for i in range(start, start + count)]
+            return httpx.Response(200, json={"startAt": start, "total": 5, "issues": issues})
+        
+        async def run():
+            async with self.make_client(handler) as client:
+                return await client.search_tickets("project = PROJ")
+        
+        assert [issue["key"] for issue in asyncio.run(run())] == [f"PROJ-{i}" for i in range(5)]
+
+
+class TestCLIParser:
+    """Tests for the CLI argument parser."""
+    
+    def test_selected_subcommand_is_built(self):
+        """Test arguments of the requested subcommand are parsed."""
+        from src.cli import create_parser
+        
+        argv = ["generate", "--input", "story.txt", "--format", "pytest"]
+        args = create_parser(argv).parse_args(argv)
+        
+        assert args.command == "generate"
+        assert args.input == "story.txt"
+        assert args.format == "pytest"
+    
+    def test_invalid_format_rejected(self, capsys):
+        """Test an unknown --format value is a usage error."""
+        from src.cli import create_parser
+        
+        argv = ["generate", "--format", "xml"]
+        with pytest.raises(SystemExit):
+            create_parser(argv).parse_args(argv)
+        
+        assert "invalid choice: 'xml'" in capsys.readouterr().err
+    
+    def test_full_parser_accepts_every_subcommand(self):
+        """Test the parser built without argv knows all subcommands."""
+        from src.cli import create_parser
+        
+        parser = create_parser()
+        
+        assert parser.parse_args(["analyze", "-i", "req.txt"]).input == "req.txt"
+        assert parser.parse_args(["generate", "-n", "3"]).num_cases == 3
+
+
+def test_interactive_rejects_empty_piped_input(monkeypatch):
+    """Test piped stdin is read in bulk and empty input is rejected."""
+    import io
+    from src.cli import main
+    
+    monkeypatch.setattr("sys.stdin", io.StringIO("  \n\n"))
+    
+    assert main(["interactive"]) == 1
+
+
+def test_interactive_piped_input_reads_format_choice(monkeypatch, capsys):
+    """Test piped stdin keeps the requirement / blank line / choice layout without prompts."""
+    import io
+    from src import generator
+    from src.cli import main
+    
+    calls = []
+    
+    class FakeGenerator:
+        def generate(self, requirement, output_format):
+            calls.append((requirement, output_format))
+            return "def test_login(): pass"
+    
+    monkeypatch.setattr(generator, "TestCaseGenerator", FakeGenerator)
+    monkeypatch.setattr("sys.stdin", io.StringIO("User logs in\nwith email\n\n2\n"))
+    
+    assert main(["interactive"]) == 0
+    assert calls == [("User logs in\nwith email", "pytest")]
+    out = capsys.readouterr().out
+    assert "Choice [1]" not in out and "press Enter twice" not in out
+
+
+def test_directory_output_to_file_rejected_before_generation(tmp_path, monkeypatch, capsys):
+    """Test --output naming a file fails before the batch LLM call is made."""
+    from src import generator
+    from src.cli import main
+    
+    (tmp_path / "login.txt").write_text("User logs in")
+    output_file = tmp_path / "out.txt"
+    output_file.write_text("")
+    monkeypatch.setattr(generator, "TestCaseGenerator", lambda: pytest.fail("generator created"))
+    
+    assert main(["generate", "--input", str(tmp_path), "--output", str(output_file)]) == 1
+    assert "Output path must be a directory" in capsys.readouterr().err
+
+
+def test_directory_empty_results_not_written(tmp_path, monkeypatch, capsys):
+    """Test a requirement with no generated output is reported instead of written empty."""
+    from src import generator
+    from src.cli import main
+    
+    class FakeGenerator:
+        def generate_batch(self, requirements, **kwargs):
+            return ["Feature: A", ""]
+    
+    input_dir = tmp_path / "stories"
+    input_dir.mkdir()
+    (input_dir / "a.txt").write_text("User logs in")
+    (input_dir / "b.txt").write_text("User uploads a file")
+    monkeypatch.setattr(generator, "TestCaseGenerator", FakeGenerator)
+    
+    assert main(["generate", "--input", str(input_dir), "--output", str(tmp_path / "out")]) == 1
+    assert (tmp_path / "out" / "a.feature").read_text() == "Feature: A"
+    assert not (tmp_path / "out" / "b.feature").exists()
+    assert "No test cases generated for: b.txt" in capsys.readouterr().err
+
+
+def test_read_text_fast_normalizes_newlines(tmp_path):
+    """Test requirement files are decoded like Path.read_text()."""
+    from src.cli import _read_text_fast
+    
+    path = tmp_path / "story.txt"
+    path.write_bytes("User enters their e-mail \u2709\r\nand password\r".encode("utf-8"))
+    
+    assert _read_text_fast(path) == "User enters their e-mail \u2709\nand password\n"
+
+
+def test_cli_import_does_not_load_llm_sdk():
+    """Test the Gemini SDK, generator and numpy are only imported when a generator is created."""
+    import subprocess
+    import sys
+    
+    code = (
+        "import sys, src.cli; "
+        "print([m in sys.modules for m in ('google.generativeai', 'src.generator', 'numpy')])"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    
+    assert result.stdout.strip() == "[False, False, False]"
+
+
 # Integration tests (require API key)
 @pytest.mark.skipif(
-    not pytest.importorskip("google.generativeai", reason="Gemini not available"),
-    reason="Gemini API not configured"
+    importlib.util.find_spec("google") is None
+    or importlib.util.find_spec("google.generativeai") is None,
+    reason="Gemini not available"
 )
 class TestGeneratorIntegration:
     """Integration tests for TestCaseGenerator (requires API key)."""